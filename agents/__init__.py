@@ -1,13 +1,40 @@
 """Agent modules for call summarizer."""
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .base_agent import BaseAgent
-from .quality_score_agent import QualityScoringAgent
-from .summarization_agent import SummarizationAgent
-from .transcription_agent import TranscriptionAgent
+
+if TYPE_CHECKING:
+    from .combined_analysis_agent import CombinedAnalysisAgent
+    from .quality_score_agent import QualityScoringAgent
+    from .summarization_agent import SummarizationAgent
+    from .transcription_agent import TranscriptionAgent
+
+# Agents pull in langchain_openai/openai, so load them on first access only
+_LAZY = {
+    "CombinedAnalysisAgent": "agents.combined_analysis_agent",
+    "QualityScoringAgent": "agents.quality_score_agent",
+    "SummarizationAgent": "agents.summarization_agent",
+    "TranscriptionAgent": "agents.transcription_agent",
+}
 
 __all__ = [
     "BaseAgent",
+    "CombinedAnalysisAgent",
     "QualityScoringAgent",
     "SummarizationAgent",
     "TranscriptionAgent",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    obj = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,15 +2,37 @@
 Base agent class with common functionality for all agents.
 """
 
+import asyncio
+import atexit
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
 
+from config.settings import get_config
+from utils.helpers import truncate_to_token_budget
 from utils.validation import AgentState
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def get_agent_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool shared across agents, created on first use.
+    
+    Sync LLM calls release the GIL while waiting on HTTP, so threads
+    overlap them well.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=get_config().model.agent_workers,
+        thread_name_prefix="agent"
+    )
+    atexit.register(executor.shutdown, wait=False)
+    return executor
+
+
 class BaseAgent(ABC):
     """Abstract base class for all processing agents."""
     
@@ -24,13 +46,74 @@ class BaseAgent(ABC):
         """Process the state - must be implemented by subclasses."""
         pass
     
+    async def aprocess(self, state: AgentState) -> AgentState:
+        """Async process; defaults to running the sync implementation in a worker thread."""
+        return await asyncio.to_thread(self.process, state)
+    
+    def process_many(self, states: Sequence[AgentState]) -> List[AgentState]:
+        """
+        Process several states concurrently on the shared thread pool.
+        
+        Args:
+            states: States to process
+            
+        Returns:
+            Results in input order
+        """
+        return list(get_agent_executor().map(self.process, states))
+    
+    async def aprocess_many(
+        self,
+        states: Sequence[AgentState],
+        max_concurrency: Optional[int] = None
+    ) -> List[Union[AgentState, BaseException]]:
+        """
+        Process several states concurrently.
+        
+        Args:
+            states: States to process
+            max_concurrency: Cap on in-flight requests (defaults to config)
+            
+        Returns:
+            Results in input order; failures are returned as exceptions
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or get_config().model.max_concurrency)
+        
+        async def run(state: AgentState) -> AgentState:
+            async with semaphore:
+                return await self.aprocess(state)
+        
+        return await asyncio.gather(*(run(state) for state in states), return_exceptions=True)
+    
+    def prepare_transcript(self, state: AgentState) -> Tuple[str, int]:
+        """
+        Tokenize the transcript once, bounding it to the prompt budget.
+        
+        The result is stored on the state, so other agents and retries reuse it.
+        Uses the tokenizer of the subclass's ``model_name``.
+        
+        Args:
+            state: State with transcript_text set
+            
+        Returns:
+            Tuple of (possibly truncated transcript, original token count)
+        """
+        if state.prompt_transcript is None:
+            max_tokens = get_config().model.max_prompt_tokens
+            state.prompt_transcript, state.transcript_tokens = truncate_to_token_budget(
+                state.transcript_text, self.model_name, max_tokens
+            )
+            if state.transcript_tokens > max_tokens:
+                self.logger.info("Transcript truncated from %d to %d tokens", state.transcript_tokens, max_tokens)
+        return state.prompt_transcript, state.transcript_tokens
+    
     def handle_error(self, state: AgentState, error: Exception, context: str = "") -> AgentState:
         """Standardized error handling across all agents."""
         error_msg = f"{context}: {str(error)}" if context else str(error)
-        self.logger.error(f"{self.agent_name} error: {error_msg}")
+        self.logger.error("%s error: %s", self.agent_name, error_msg)
         state.add_error(self.agent_name, error_msg)
         return state
     
     def log_success(self, state: AgentState, message: str) -> None:
         """Log successful operation."""
-        self.logger.info(f"{message} for call {state.call_id}")
\ No newline at end of file
+        self.logger.info("%s for call %s", message, state.call_id)
@@ -0,0 +1,127 @@
+"""
+Combined Analysis Agent - summary and quality scores from a single LLM call.
+"""
+
+from typing import Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+from openai import APIError
+
+from agents.base_agent import BaseAgent
+from agents.prompts import COMBINED_HUMAN_PREFIX, COMBINED_SYSTEM_MSG
+from agents.quality_score_agent import INSUFFICIENT_CONTENT_SCORE
+from agents.summarization_agent import INSUFFICIENT_CONTENT_SUMMARY
+from config.settings import get_config, ModelProvider
+from utils.clients import get_chat_model, llm_retry
+from utils.constants import DEFAULT_LLM_MODEL, MIN_TRANSCRIPT_TOKENS
+from utils.exceptions import AnalysisError, LLMResponseError
+from utils.helpers import parse_llm_json_response
+from utils.validation import AgentState, CallSummary, QualityScore
+
+
+class CombinedAnalysisAgent(BaseAgent):
+    """Agent that produces both the call summary and quality scores in one LLM round-trip."""
+    
+    def __init__(
+        self,
+        model_provider: Optional[ModelProvider] = None,
+        api_key: Optional[str] = None,
+        llm: Optional[BaseChatModel] = None
+    ):
+        super().__init__("combined_analysis")
+        config = get_config()
+        
+        # Use config defaults if not specified
+        self.model_provider = model_provider or config.model.llm_provider
+        api_key = api_key or config.api.openai_api_key
+        
+        if llm is not None:
+            self.model_name = getattr(llm, "model_name", None) or config.model.llm_model or DEFAULT_LLM_MODEL
+            self.llm = llm.bind(response_format={"type": "json_object"})
+        elif self.model_provider == ModelProvider.OPENAI:
+            if not api_key:
+                raise AnalysisError("OpenAI API key is required.")
+            self.model_name = config.model.llm_model or DEFAULT_LLM_MODEL
+            self.llm = get_chat_model(
+                model=self.model_name,
+                temperature=0,
+                api_key=api_key
+            ).bind(response_format={"type": "json_object"})
+        else:
+            raise AnalysisError(f"Unsupported model provider: {self.model_provider}")
+    
+    def process(self, state: AgentState) -> AgentState:
+        """Generate summary and quality scores from transcript text."""
+        if not state.transcript_text:
+            state.add_error(self.agent_name, "No transcript text available")
+            return state
+        
+        transcript, token_count = self.prepare_transcript(state)
+        if token_count < MIN_TRANSCRIPT_TOKENS:
+            self.logger.info("Transcript has only %d tokens; skipping combined analysis", token_count)
+            state.summary, state.quality_score = INSUFFICIENT_CONTENT_SUMMARY, INSUFFICIENT_CONTENT_SCORE
+            return state
+        
+        try:
+            state.summary, state.quality_score = self._invoke_and_parse(self._build_messages(transcript))
+            self.log_success(state, "Combined analysis completed")
+            return state
+        
+        except (APIError, LLMResponseError) as e:
+            return self.handle_error(state, e, "Combined analysis failed")
+    
+    async def aprocess(self, state: AgentState) -> AgentState:
+        """Generate summary and quality scores without blocking the event loop."""
+        if not state.transcript_text:
+            state.add_error(self.agent_name, "No transcript text available")
+            return state
+        
+        transcript, token_count = self.prepare_transcript(state)
+        if token_count < MIN_TRANSCRIPT_TOKENS:
+            self.logger.info("Transcript has only %d tokens; skipping combined analysis", token_count)
+            state.summary, state.quality_score = INSUFFICIENT_CONTENT_SUMMARY, INSUFFICIENT_CONTENT_SCORE
+            return state
+        
+        try:
+            state.summary, state.quality_score = await self._ainvoke_and_parse(self._build_messages(transcript))
+            self.log_success(state, "Combined analysis completed")
+            return state
+        
+        except (APIError, LLMResponseError) as e:
+            return self.handle_error(state, e, "Combined analysis failed")
+    
+    def _build_messages(self, transcript: str) -> list:
+        """Build the combined prompt for a transcript already bounded by prepare_transcript."""
+        return [
+            COMBINED_SYSTEM_MSG,
+            HumanMessage(content=f"{COMBINED_HUMAN_PREFIX}{transcript}")
+        ]
+    
+    @llm_retry(LLMResponseError)
+    def _invoke_and_parse(self, messages: list) -> Tuple[CallSummary, QualityScore]:
+        """Call the LLM and split its response, retrying transient errors and invalid output."""
+        return self._parse_response(self.llm.invoke(messages))
+    
+    @llm_retry(LLMResponseError)
+    async def _ainvoke_and_parse(self, messages: list) -> Tuple[CallSummary, QualityScore]:
+        """Async counterpart of _invoke_and_parse."""
+        return self._parse_response(await self.llm.ainvoke(messages))
+    
+    @staticmethod
+    def _parse_response(response) -> Tuple[CallSummary, QualityScore]:
+        """Split the combined JSON object into a CallSummary and a QualityScore."""
+        content = response.content if hasattr(response, 'content') else str(response)
+        
+        try:
+            data = parse_llm_json_response(content)
+            summary = CallSummary.model_validate(
+                {field: data.get(field) for field in CallSummary.model_fields}
+            )
+            quality_score = QualityScore.model_validate(
+                {field: data.get(field) for field in QualityScore.model_fields}
+            )
+        except ValueError as e:
+            raise LLMResponseError(f"Failed to parse combined analysis: {str(e)}")
+        
+        return summary, quality_score
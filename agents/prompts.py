@@ -0,0 +1,176 @@
+"""
+Prompt templates shared by the LLM agents.
+
+System messages are built once at import so every request sends a
+byte-identical prefix, which lets provider-side prompt caching match it.
+Human messages likewise start with fixed text and end with the transcript,
+after TRANSCRIPT_DELIMITER, so only the tail of each request varies.
+"""
+
+import hashlib
+from typing import Final
+
+from langchain_core.messages import SystemMessage
+
+# Keep byte-identical across calls; everything before it is cacheable
+TRANSCRIPT_DELIMITER: Final[str] = "<<TRANSCRIPT>>"
+
+SUMMARY_PROMPT: Final[str] = """You are a call center analyst. Create a structured summary of this call transcript.
+
+Respond in JSON format only:
+{
+    "sentiment": "positive|neutral|negative", 
+    "outcome": "resolved|escalated|follow_up|unresolved",
+    "summary": "Brief executive summary (1-2 sentences)",
+    "key_points": ["List of 3-5 key discussion points"]
+}"""
+
+SUMMARY_SYSTEM_MSG: Final[SystemMessage] = SystemMessage(content=SUMMARY_PROMPT)
+
+SUMMARY_HUMAN_PREFIX: Final[str] = (
+    f"Analyze the call transcript that follows the {TRANSCRIPT_DELIMITER} line.\n\n{TRANSCRIPT_DELIMITER}\n"
+)
+
+# Reduce step for long calls summarized in parts; the parts replace the transcript
+SUMMARY_REDUCE_HUMAN_PREFIX: Final[str] = (
+    "The call was too long to analyze at once, so consecutive parts of it were summarized "
+    "separately. Combine the partial summaries that follow into one summary of the whole call.\n\n"
+)
+
+
+BATCH_SUMMARY_PROMPT: Final[str] = """You are a call center analyst. You will receive several call transcripts, each introduced by a numbered <<TRANSCRIPT n>> line. Create a structured summary of each one.
+
+Respond in JSON format only, with exactly one summary per transcript, in the same order:
+{
+    "summaries": [
+        {
+            "sentiment": "positive|neutral|negative",
+            "outcome": "resolved|escalated|follow_up|unresolved",
+            "summary": "Brief executive summary (1-2 sentences)",
+            "key_points": ["List of 3-5 key discussion points"]
+        }
+    ]
+}"""
+
+BATCH_SUMMARY_SYSTEM_MSG: Final[SystemMessage] = SystemMessage(content=BATCH_SUMMARY_PROMPT)
+
+
+# Scoring criteria shared by the single and batched quality prompts
+QUALITY_CRITERIA: Final[str] = """SCORING RUBRIC (1-10 scale for each dimension):
+
+1. TONE SCORE (1-10):
+   - 9-10: Exceptionally warm, friendly, patient, and engaging throughout
+   - 7-8: Consistently positive and approachable with good clarity
+   - 5-6: Generally appropriate but may lack warmth or have occasional lapses
+   - 3-4: Often cold, impatient, or unclear in communication
+   - 1-2: Hostile, dismissive, or extremely unclear
+
+   Evaluate: Friendliness, patience, clarity of speech, emotional appropriateness
+
+2. PROFESSIONALISM SCORE (1-10):
+   - 9-10: Expert knowledge, flawless protocol adherence, exceptional language use
+   - 7-8: Strong competence, follows procedures well, professional language
+   - 5-6: Adequate knowledge, mostly follows protocols, acceptable language
+   - 3-4: Limited knowledge, frequent protocol violations, unprofessional moments
+   - 1-2: Severe lack of knowledge, major protocol breaches, highly unprofessional
+
+   Evaluate: Product/service knowledge, adherence to company protocols, language appropriateness, competence
+
+3. RESOLUTION SCORE (1-10):
+   - 9-10: Completely resolved issue, exceeded expectations, proactive solutions
+   - 7-8: Successfully resolved main issue, customer satisfied
+   - 5-6: Partial resolution achieved or escalated appropriately
+   - 3-4: Minimal progress on issue, unclear next steps
+   - 1-2: Failed to address issue, left customer worse off
+
+   Evaluate: Problem-solving effectiveness, issue closure, customer satisfaction indicators"""
+
+QUALITY_RUBRIC: Final[str] = f"""You are an expert call center quality analyst. Evaluate this call transcript using the following structured rubric.
+
+{QUALITY_CRITERIA}
+
+Respond in JSON format only.
+
+IMPORTANT: The "feedback" field must be a single string (not an object or dictionary), providing a brief summary of strengths and areas for improvement.
+
+Example format:
+{{
+    "tone_score": 8.0,
+    "professionalism_score": 7.5,
+    "resolution_score": 9.0,
+    "feedback": "Agent demonstrated excellent empathy and patience when handling customer frustration. Successfully resolved the password reset issue. Could improve by offering additional self-service options for future reference."
+}}"""
+
+QUALITY_SYSTEM_MSG: Final[SystemMessage] = SystemMessage(content=QUALITY_RUBRIC)
+
+QUALITY_HUMAN_PREFIX: Final[str] = (
+    f"Evaluate the call transcript that follows the {TRANSCRIPT_DELIMITER} line "
+    f"using the structured rubric.\n\n{TRANSCRIPT_DELIMITER}\n"
+)
+
+BATCH_QUALITY_PROMPT: Final[str] = f"""You are an expert call center quality analyst. You will receive several call transcripts, each introduced by a numbered <<TRANSCRIPT n>> line. Evaluate each one separately using the following structured rubric.
+
+{QUALITY_CRITERIA}
+
+Respond in JSON format only, with exactly one evaluation per transcript, in the same order. Each "feedback" field must be a single string (not an object or dictionary), providing a brief summary of strengths and areas for improvement.
+
+{{
+    "scores": [
+        {{
+            "tone_score": 8.0,
+            "professionalism_score": 7.5,
+            "resolution_score": 9.0,
+            "feedback": "Brief summary of strengths and areas for improvement"
+        }}
+    ]
+}}"""
+
+BATCH_QUALITY_SYSTEM_MSG: Final[SystemMessage] = SystemMessage(content=BATCH_QUALITY_PROMPT)
+
+
+COMBINED_PROMPT: Final[str] = """You are an expert call center analyst. Summarize this call transcript and evaluate the agent's quality in a single response.
+
+SUMMARY:
+- summary: Brief executive summary (1-2 sentences)
+- key_points: List of 3-5 key discussion points
+- sentiment: One of "positive", "neutral", "negative"
+- outcome: One of "resolved", "escalated", "follow_up", "unresolved"
+
+QUALITY SCORING RUBRIC (1-10 scale for each dimension):
+
+1. TONE SCORE: Friendliness, patience, clarity of speech, emotional appropriateness
+   - 9-10: Exceptionally warm and engaging; 7-8: Consistently positive; 5-6: Appropriate but lacking warmth;
+     3-4: Often cold or unclear; 1-2: Hostile or dismissive
+
+2. PROFESSIONALISM SCORE: Product knowledge, protocol adherence, language, competence
+   - 9-10: Expert and flawless; 7-8: Strong competence; 5-6: Adequate; 3-4: Frequent lapses; 1-2: Severe breaches
+
+3. RESOLUTION SCORE: Problem-solving effectiveness, issue closure, customer satisfaction
+   - 9-10: Resolved and exceeded expectations; 7-8: Resolved; 5-6: Partial or escalated appropriately;
+     3-4: Minimal progress; 1-2: Left customer worse off
+
+Respond in JSON format only. The "feedback" field must be a single string summarizing strengths and areas for improvement.
+
+Example format:
+{
+    "summary": "Customer called to reset a password; the agent verified identity and reset it.",
+    "key_points": ["Password reset requested", "Identity verified", "Reset completed"],
+    "sentiment": "positive",
+    "outcome": "resolved",
+    "tone_score": 8.0,
+    "professionalism_score": 7.5,
+    "resolution_score": 9.0,
+    "feedback": "Agent was patient and resolved the issue quickly. Could offer self-service options next time."
+}"""
+
+COMBINED_SYSTEM_MSG: Final[SystemMessage] = SystemMessage(content=COMBINED_PROMPT)
+
+COMBINED_HUMAN_PREFIX: Final[str] = (
+    f"Analyze the call transcript that follows the {TRANSCRIPT_DELIMITER} line.\n\n{TRANSCRIPT_DELIMITER}\n"
+)
+
+# Changes whenever any system prompt does, so cached results from older prompts aren't reused
+PROMPTS_DIGEST: Final[str] = hashlib.blake2b(
+    "\0".join((SUMMARY_PROMPT, BATCH_SUMMARY_PROMPT, QUALITY_RUBRIC, BATCH_QUALITY_PROMPT, COMBINED_PROMPT)).encode(),
+    digest_size=8
+).hexdigest()
@@ -2,18 +2,55 @@
 Refactored Quality Scoring Agent with improved structure.
 """
 
-from typing import Optional, List
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import Dict, List, Optional, Tuple
 
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+from openai import APIError
+from pydantic import BaseModel, ValidationError
 
 from agents.base_agent import BaseAgent
-from config.settings import config, ModelProvider
-from utils.constants import DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE
+from agents.prompts import (
+    BATCH_QUALITY_SYSTEM_MSG,
+    QUALITY_HUMAN_PREFIX,
+    QUALITY_RUBRIC,
+    QUALITY_SYSTEM_MSG,
+)
+from config.settings import get_config, ModelProvider
+from utils.batching import AsyncDynamicBatchScorer
+from utils.clients import get_chat_model, llm_retry
+from utils.constants import (
+    DEFAULT_BATCH_WAIT_TIMEOUT_S,
+    DEFAULT_LLM_MODEL,
+    DEFAULT_MAX_BATCH_SIZE,
+    LOW_CONFIDENCE_SCORE_SPREAD,
+    MIN_TRANSCRIPT_TOKENS,
+    MODEL_CASCADE,
+    SCORE_CACHE_MAX_ENTRIES,
+)
 from utils.exceptions import QualityScoringError, LLMResponseError
-from utils.helpers import parse_llm_json_response
+from utils.helpers import JsonObjectScanner, strip_code_fence
 from utils.validation import AgentState, QualityScore
 
+# Returned without an LLM call when the transcript is too short to evaluate
+INSUFFICIENT_CONTENT_SCORE = QualityScore(
+    tone_score=1.0,
+    professionalism_score=1.0,
+    resolution_score=1.0,
+    feedback="Insufficient content to evaluate."
+)
+
+
+class _QualityBatch(BaseModel):
+    """Response shape for a batched quality scoring request."""
+    
+    scores: List[QualityScore]
+
 
 class QualityScoringAgent(BaseAgent):
     """Refactored agent for evaluating call quality."""
@@ -21,24 +58,69 @@ class QualityScoringAgent(BaseAgent):
     def __init__(
         self,
         model_provider: Optional[ModelProvider] = None,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        enable_dynamic_batch: bool = False,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_wait_timeout_s: float = DEFAULT_BATCH_WAIT_TIMEOUT_S,
+        stream_early_abort: bool = False,
+        llm: Optional[BaseChatModel] = None
     ):
         super().__init__("quality_scoring")
+        config = get_config()
+        
+        # Stream responses and stop reading once the JSON object closes
+        self.stream_early_abort = stream_early_abort
         
         # Use config defaults if not specified
         self.model_provider = model_provider or config.model.llm_provider
         api_key = api_key or config.api.openai_api_key
         
-        if self.model_provider == ModelProvider.OPENAI:
+        if llm is not None:
+            # Injected model is used as-is, without escalation
+            self.model_name = getattr(llm, "model_name", None) or config.model.llm_model or DEFAULT_LLM_MODEL
+            self._llm_cascade = [(self.model_name, llm.bind(response_format={"type": "json_object"}))]
+            self.llm = self._llm_cascade[0][1]
+        elif self.model_provider == ModelProvider.OPENAI:
             if not api_key:
                 raise QualityScoringError("OpenAI API key is required.")
-            self.llm = ChatOpenAI(
-                model=config.model.llm_model or DEFAULT_LLM_MODEL,
-                temperature=0,  # Lower temperature for more consistent scoring
-                api_key=api_key
+            self.model_name = config.model.llm_model or DEFAULT_LLM_MODEL
+            
+            # Configured model first, then any stronger models after it in the cascade
+            escalation = (
+                MODEL_CASCADE[MODEL_CASCADE.index(self.model_name) + 1:]
+                if self.model_name in MODEL_CASCADE else []
             )
+            # JSON mode guarantees a parseable object, so no repair/fallback path is needed
+            self._llm_cascade = [
+                (model, get_chat_model(
+                    model=model,
+                    temperature=0,  # Lower temperature for more consistent scoring
+                    api_key=api_key
+                ).bind(response_format={"type": "json_object"}))
+                for model in [self.model_name, *escalation]
+            ]
+            self.llm = self._llm_cascade[0][1]
         else:
             raise QualityScoringError(f"Unsupported model provider: {self.model_provider}")
+        
+        # Content-addressed score cache; the salt ties entries to this model and rubric
+        self._score_cache: OrderedDict[bytes, QualityScore] = OrderedDict()
+        self._score_cache_lock = threading.Lock()
+        self._cache_salt = hashlib.blake2b(
+            f"{self.model_name}\0{QUALITY_RUBRIC}".encode(), digest_size=32
+        ).digest()
+        
+        # Single-flight: concurrent requests for the same transcript share one call
+        self._inflight: Dict[bytes, asyncio.Task] = {}
+        
+        # Optional micro-batching of concurrent aprocess calls into shared requests
+        self._batch_scorer: Optional[AsyncDynamicBatchScorer[QualityScore]] = None
+        if enable_dynamic_batch:
+            self._batch_scorer = AsyncDynamicBatchScorer(
+                self._score_batch_async,
+                max_batch_size=max_batch_size,
+                batch_wait_timeout_s=batch_wait_timeout_s
+            )
     
     def process(self, state: AgentState) -> AgentState:
         """Evaluate call quality from transcript text."""
@@ -46,101 +128,253 @@ class QualityScoringAgent(BaseAgent):
             state.add_error(self.agent_name, "No transcript text available")
             return state
         
+        transcript, token_count = self.prepare_transcript(state)
+        if token_count < MIN_TRANSCRIPT_TOKENS:
+            self.logger.info("Transcript has only %d tokens; skipping quality scoring", token_count)
+            state.quality_score = INSUFFICIENT_CONTENT_SCORE
+            return state
+        
         try:
             # Evaluate quality from transcript
-            quality_score = self._evaluate_quality(state.transcript_text)
+            quality_score = self._evaluate_quality(transcript)
             self.log_success(state, "Quality evaluation completed")
                 
             state.quality_score = quality_score
             return state
             
-        except Exception as e:
+        except (APIError, LLMResponseError) as e:
             return self.handle_error(state, e, "Quality scoring failed")
     
-    def _evaluate_quality(self, transcript: str) -> QualityScore:
-        """Evaluate call quality using LLM with structured rubric."""
-        system_prompt = self._get_basic_rubric()
-        human_prompt = f"Evaluate this call transcript using the structured rubric:\n\n{transcript}"
+    async def aprocess(self, state: AgentState) -> AgentState:
+        """Evaluate call quality from transcript text without blocking the event loop."""
+        if not state.transcript_text:
+            state.add_error(self.agent_name, "No transcript text available")
+            return state
         
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=human_prompt)
-        ]
+        transcript, token_count = self.prepare_transcript(state)
+        if token_count < MIN_TRANSCRIPT_TOKENS:
+            self.logger.info("Transcript has only %d tokens; skipping quality scoring", token_count)
+            state.quality_score = INSUFFICIENT_CONTENT_SCORE
+            return state
         
         try:
-            response = self.llm.invoke(messages)
-            content = response.content if hasattr(response, 'content') else str(response)
-            
-            # Use helper function for JSON parsing with fallback
-            fallback_score = self._get_fallback_score()
+            if self._batch_scorer:
+                tokens = min(token_count, get_config().model.max_prompt_tokens)
+                quality_score = await self._batch_scorer.submit(transcript, tokens)
+            else:
+                quality_score = await self._evaluate_quality_async(transcript)
+            self.log_success(state, "Quality evaluation completed")
+                
+            state.quality_score = quality_score
+            return state
             
+        except (APIError, LLMResponseError) as e:
+            return self.handle_error(state, e, "Quality scoring failed")
+    
+    def _evaluate_quality(self, transcript: str) -> QualityScore:
+        """Evaluate call quality using LLM with structured rubric."""
+        cache_key = self._cache_key(transcript)
+        cached = self._get_cached_score(cache_key)
+        if cached:
+            return cached
+        
+        messages = self._build_messages(transcript)
+        # API errors propagate as-is; invalid or low-confidence output escalates to the next model
+        uncertain = None
+        for model, llm in self._llm_cascade:
+            score, confident = self._judge_tier(model, self._invoke_llm(llm, messages))
+            if confident:
+                return self._cache_score(cache_key, score)
+            if score is not None:
+                uncertain = score
+        return self._settle_cascade(cache_key, uncertain)
+    
+    async def _evaluate_quality_async(self, transcript: str) -> QualityScore:
+        """Async counterpart of _evaluate_quality using the LLM's native ainvoke."""
+        cache_key = self._cache_key(transcript)
+        cached = self._get_cached_score(cache_key)
+        if cached:
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(cache_key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._score_async(transcript, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        
+        # Shield so one cancelled caller doesn't cancel the call for the others
+        return await asyncio.shield(task)
+    
+    async def _score_async(self, transcript: str, cache_key: bytes) -> QualityScore:
+        """Run the model cascade for a transcript that isn't cached."""
+        messages = self._build_messages(transcript)
+        # API errors propagate as-is; invalid or low-confidence output escalates to the next model
+        uncertain = None
+        for model, llm in self._llm_cascade:
+            score, confident = self._judge_tier(model, await self._ainvoke_llm(llm, messages))
+            if confident:
+                return self._cache_score(cache_key, score)
+            if score is not None:
+                uncertain = score
+        return self._settle_cascade(cache_key, uncertain)
+    
+    async def _score_batch_async(self, transcripts: List[str]) -> List[QualityScore]:
+        """Score a micro-batch, sending its uncached transcripts in one request."""
+        keys = [self._cache_key(transcript) for transcript in transcripts]
+        scores: Dict[bytes, QualityScore] = {}
+        pending: Dict[bytes, str] = {}
+        for key, transcript in zip(keys, transcripts):
+            if key in scores or key in pending:
+                continue
+            cached = self._get_cached_score(key)
+            if cached:
+                scores[key] = cached
+            else:
+                pending[key] = transcript
+        
+        if len(pending) > 1:
             try:
-                quality_dict = parse_llm_json_response(content)
-            except Exception as parse_error:
-                self.logger.warning(f"Using fallback score due to: {parse_error}")
-                quality_dict = fallback_score
-            
-            return QualityScore(**quality_dict)
-                
-        except Exception as e:
-            raise LLMResponseError(f"Failed to evaluate quality: {str(e)}")
+                batch_scores = await self._ainvoke_and_parse_batch(
+                    self._build_batch_messages(list(pending.values())), len(pending)
+                )
+            except ValidationError as e:
+                raise LLMResponseError(f"Failed to evaluate quality: {e}") from e
+            for key, score in zip(list(pending), batch_scores):
+                if not self._is_low_confidence(score):
+                    scores[key] = self._cache_score(key, score)
+                    del pending[key]
+        
+        # A lone transcript, or uniform scores from the batch, go through the cascade, which can escalate
+        singles = await asyncio.gather(*(self._evaluate_quality_async(transcript) for transcript in pending.values()))
+        scores.update(zip(pending, singles))
+        return [scores[key] for key in keys]
+    
+    @llm_retry(ValidationError, LLMResponseError)
+    async def _ainvoke_and_parse_batch(self, messages: list, expected: int) -> List[QualityScore]:
+        """Call the LLM once for a micro-batch, retrying transient errors and invalid output."""
+        return self._parse_batch_response(await self.llm.ainvoke(messages), expected)
     
+    def _judge_tier(self, model: str, response) -> Tuple[Optional[QualityScore], bool]:
+        """Parse one cascade tier's response; returns the score (None if invalid) and whether to stop."""
+        try:
+            score = self._parse_quality_response(response)
+        except ValidationError as e:
+            self.logger.warning("Invalid quality score from %s: %s", model, e)
+            return None, False
+        if self._is_low_confidence(score):
+            self.logger.info("Low-confidence (uniform) quality scores from %s", model)
+            return score, False
+        return score, True
     
+    def _settle_cascade(self, cache_key: bytes, uncertain: Optional[QualityScore]) -> QualityScore:
+        """Fall back once every tier was unsure or invalid."""
+        # Keep the strongest model's uniform scores if any tier produced them
+        if uncertain is not None:
+            return self._cache_score(cache_key, uncertain)
+        raise LLMResponseError("Failed to evaluate quality: no model returned a valid score")
+    
+    # Invalid output isn't retried here; it escalates to the next model instead
+    @llm_retry()
+    def _invoke_llm(self, llm, messages: list):
+        """Invoke the LLM, optionally stopping the stream once the JSON object is complete."""
+        if not self.stream_early_abort:
+            return llm.invoke(messages)
+        
+        scanner = JsonObjectScanner()
+        parts = []
+        for chunk in llm.stream(messages):
+            # Text after the closing brace would fail strict JSON parsing
+            end = scanner.feed(chunk.content)
+            parts.append(chunk.content[:end])
+            if end is not None:
+                break
+        return "".join(parts)
+    
+    @llm_retry()
+    async def _ainvoke_llm(self, llm, messages: list):
+        """Async counterpart of _invoke_llm."""
+        if not self.stream_early_abort:
+            return await llm.ainvoke(messages)
+        
+        scanner = JsonObjectScanner()
+        parts = []
+        async with aclosing(llm.astream(messages)) as stream:
+            async for chunk in stream:
+                end = scanner.feed(chunk.content)
+                parts.append(chunk.content[:end])
+                if end is not None:
+                    break
+        return "".join(parts)
+    
+    def _build_messages(self, transcript: str) -> list:
+        """Build the rubric prompt for a transcript already bounded by prepare_transcript."""
+        human_prompt = f"{QUALITY_HUMAN_PREFIX}{transcript}"
+        
+        return [
+            QUALITY_SYSTEM_MSG,
+            HumanMessage(content=human_prompt)
+        ]
+    
+    def _build_batch_messages(self, transcripts: List[str]) -> list:
+        """Build one rubric prompt holding a micro-batch's numbered transcripts."""
+        numbered = "\n\n".join(
+            f"<<TRANSCRIPT {i}>>\n{transcript}" for i, transcript in enumerate(transcripts, 1)
+        )
+        human_prompt = (
+            f"Evaluate each of the {len(transcripts)} call transcripts below using the structured rubric."
+            f"\n\n{numbered}"
+        )
+        
+        return [
+            BATCH_QUALITY_SYSTEM_MSG,
+            HumanMessage(content=human_prompt)
+        ]
     
     @staticmethod
-    def _get_basic_rubric() -> str:
-        """Get the basic quality evaluation rubric."""
-        return """You are an expert call center quality analyst. Evaluate this call transcript using the following structured rubric.
-
-SCORING RUBRIC (1-10 scale for each dimension):
-
-1. TONE SCORE (1-10):
-   - 9-10: Exceptionally warm, friendly, patient, and engaging throughout
-   - 7-8: Consistently positive and approachable with good clarity
-   - 5-6: Generally appropriate but may lack warmth or have occasional lapses
-   - 3-4: Often cold, impatient, or unclear in communication
-   - 1-2: Hostile, dismissive, or extremely unclear
-
-   Evaluate: Friendliness, patience, clarity of speech, emotional appropriateness
-
-2. PROFESSIONALISM SCORE (1-10):
-   - 9-10: Expert knowledge, flawless protocol adherence, exceptional language use
-   - 7-8: Strong competence, follows procedures well, professional language
-   - 5-6: Adequate knowledge, mostly follows protocols, acceptable language
-   - 3-4: Limited knowledge, frequent protocol violations, unprofessional moments
-   - 1-2: Severe lack of knowledge, major protocol breaches, highly unprofessional
-
-   Evaluate: Product/service knowledge, adherence to company protocols, language appropriateness, competence
-
-3. RESOLUTION SCORE (1-10):
-   - 9-10: Completely resolved issue, exceeded expectations, proactive solutions
-   - 7-8: Successfully resolved main issue, customer satisfied
-   - 5-6: Partial resolution achieved or escalated appropriately
-   - 3-4: Minimal progress on issue, unclear next steps
-   - 1-2: Failed to address issue, left customer worse off
-
-   Evaluate: Problem-solving effectiveness, issue closure, customer satisfaction indicators
-
-Respond in JSON format only. Do not use code blocks, backticks, or any markdown formatting. Your response must be pure JSON that starts with { and ends with }.
-
-IMPORTANT: The "feedback" field must be a single string (not an object or dictionary), providing a brief summary of strengths and areas for improvement.
+    def _parse_batch_response(response, expected: int) -> List[QualityScore]:
+        """Parse a batched response, checking there is one score per transcript."""
+        content = response.content if hasattr(response, 'content') else str(response)
+        scores = _QualityBatch.model_validate_json(strip_code_fence(content)).scores
+        if len(scores) != expected:
+            raise LLMResponseError(f"Expected {expected} scores, got {len(scores)}")
+        return scores
+    
+    def _parse_quality_response(self, response) -> QualityScore:
+        """Parse an LLM response into a QualityScore."""
+        content = response.content if hasattr(response, 'content') else str(response)
+        # Parse and validate in one pass inside pydantic-core
+        return QualityScore.model_validate_json(strip_code_fence(content))
 
-Example format:
-{
-    "tone_score": 8.0,
-    "professionalism_score": 7.5,
-    "resolution_score": 9.0,
-    "feedback": "Agent demonstrated excellent empathy and patience when handling customer frustration. Successfully resolved the password reset issue. Could improve by offering additional self-service options for future reference."
-}"""
     
+    @staticmethod
+    def _is_low_confidence(score: QualityScore) -> bool:
+        """Whether the scores are so uniform the model likely didn't discriminate."""
+        spread = (
+            abs(score.tone_score - score.professionalism_score)
+            + abs(score.professionalism_score - score.resolution_score)
+        )
+        return spread < LOW_CONFIDENCE_SCORE_SPREAD
+    
+    def _cache_key(self, transcript: str) -> bytes:
+        """Hash a transcript together with the model and rubric."""
+        return hashlib.blake2b(transcript.encode(), digest_size=16, key=self._cache_salt).digest()
     
+    def _get_cached_score(self, key: bytes) -> Optional[QualityScore]:
+        """Return a previously computed score, if any."""
+        with self._score_cache_lock:
+            score = self._score_cache.get(key)
+            if score is not None:
+                self._score_cache.move_to_end(key)
+        if score is not None:
+            self.logger.debug("Quality score cache hit")
+        return score
     
-    @staticmethod
-    def _get_fallback_score() -> dict:
-        """Get a fallback quality score structure."""
-        return {
-            "tone_score": 0.0,
-            "professionalism_score": 0.0,
-            "resolution_score": 0.0,
-            "feedback": "Unable to evaluate quality due to processing error."
-        }
\ No newline at end of file
+    def _cache_score(self, key: bytes, score: QualityScore) -> QualityScore:
+        """Store a score, evicting the least recently used entry when full."""
+        with self._score_cache_lock:
+            self._score_cache[key] = score
+            self._score_cache.move_to_end(key)
+            if len(self._score_cache) > SCORE_CACHE_MAX_ENTRIES:
+                self._score_cache.popitem(last=False)
+        return score
\ No newline at end of file
@@ -2,18 +2,56 @@
 Refactored Summarization Agent with improved structure and utilities.
 """
 
-from typing import Optional, List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Dict, Optional, List, Sequence, Tuple
 
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+from langchain_core.utils.json import parse_partial_json
+from openai import APIError
+from pydantic import BaseModel, ValidationError
 
 from agents.base_agent import BaseAgent
-from config.settings import config, ModelProvider
-from utils.constants import DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE
+from agents.prompts import (
+    BATCH_SUMMARY_SYSTEM_MSG,
+    SUMMARY_HUMAN_PREFIX,
+    SUMMARY_REDUCE_HUMAN_PREFIX,
+    SUMMARY_SYSTEM_MSG,
+)
+from config.settings import get_config, ModelProvider
+from utils.clients import get_chat_model, llm_retry
+from utils.cache import ExactMatchCache
+from utils.constants import (
+    BATCH_PROMPT_MAX_TOKENS,
+    DEFAULT_LLM_MODEL,
+    DEFAULT_MAX_BATCH_SIZE,
+    MAP_REDUCE_CHUNK_TOKENS,
+    MIN_TRANSCRIPT_TOKENS,
+    MODEL_CASCADE,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    SUMMARY_PROMPT_CACHE_KEY,
+)
 from utils.exceptions import SummarizationError, LLMResponseError
-from utils.helpers import parse_llm_json_response
+from utils.helpers import json_schema_response_format, split_to_token_budget
+from utils.semantic_cache import SemanticCache
 from utils.validation import AgentState, CallSummary
 
+# Returned without an LLM call when the transcript is too short to summarize
+INSUFFICIENT_CONTENT_SUMMARY = CallSummary(
+    summary="Insufficient content to summarize.",
+    key_points=[],
+    sentiment="neutral",
+    outcome="unresolved"
+)
+
+
+class _SummaryBatch(BaseModel):
+    """Response shape for a batched summarization request."""
+    
+    summaries: List[CallSummary]
+
 
 class SummarizationAgent(BaseAgent):
     """Refactored agent for generating call summaries."""
@@ -21,24 +59,70 @@ class SummarizationAgent(BaseAgent):
     def __init__(
         self,
         model_provider: Optional[ModelProvider] = None,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        llm: Optional[BaseChatModel] = None,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None,
+        semantic_cache: Optional[SemanticCache[CallSummary]] = None
     ):
         super().__init__("summarization")
+        config = get_config()
+        
+        # Byte-identical prompts are answered from memory; the optional semantic
+        # tier behind it is for callers using the agent on its own (the workflow
+        # caches the full analysis instead)
+        self._exact_cache: ExactMatchCache[CallSummary] = ExactMatchCache(SUMMARY_CACHE_MAX_ENTRIES)
+        self.semantic_cache = semantic_cache
+        
+        # When set, responses are streamed and each newly completed field
+        # (e.g. sentiment/outcome for routing) is reported before the rest arrives
+        self.on_partial = on_partial
         
         # Use config defaults if not specified
         self.model_provider = model_provider or config.model.llm_provider
         api_key = api_key or config.api.openai_api_key
         
-        if self.model_provider == ModelProvider.OPENAI:
+        # Strict structured outputs: the API guarantees JSON matching the schema,
+        # so responses are validated directly with no fence stripping or repair
+        summary_format = json_schema_response_format(CallSummary)
+        
+        if llm is not None:
+            # Injected model is used as-is, without escalation
+            self.model_name = getattr(llm, "model_name", None) or config.model.llm_model or DEFAULT_LLM_MODEL
+            self.temperature = getattr(llm, "temperature", None)
+            base_llm = llm
+            self._llm_cascade = [(self.model_name, llm.bind(response_format=summary_format))]
+        elif self.model_provider == ModelProvider.OPENAI:
             if not api_key:
                 raise SummarizationError("OpenAI API key is required.")
-            self.llm = ChatOpenAI(
-                model=config.model.llm_model or DEFAULT_LLM_MODEL,
-                temperature=config.model.llm_temperature or DEFAULT_LLM_TEMPERATURE,
+            self.model_name = config.model.llm_model or DEFAULT_LLM_MODEL
+            self.temperature = config.model.llm_temperature
+            # The static system prompt leads every request; a shared cache key routes
+            # them to the same servers so that prefix is read from OpenAI's prompt
+            # cache rather than prefilled again
+            base_llm = get_chat_model(
+                model=self.model_name,
+                temperature=self.temperature,
                 api_key=api_key
+            ).bind(prompt_cache_key=SUMMARY_PROMPT_CACHE_KEY)
+            
+            # Configured (cheap) model first; stronger models only see calls it fumbles
+            escalation = (
+                MODEL_CASCADE[MODEL_CASCADE.index(self.model_name) + 1:]
+                if self.model_name in MODEL_CASCADE else []
             )
+            self._llm_cascade = [(self.model_name, base_llm.bind(response_format=summary_format))] + [
+                (model, get_chat_model(
+                    model=model,
+                    temperature=self.temperature,
+                    api_key=api_key
+                ).bind(prompt_cache_key=SUMMARY_PROMPT_CACHE_KEY, response_format=summary_format))
+                for model in escalation
+            ]
         else:
             raise SummarizationError(f"Unsupported model provider: {self.model_provider}")
+        
+        self.llm = self._llm_cascade[0][1]
+        self._batch_llm = base_llm.bind(response_format=json_schema_response_format(_SummaryBatch))
     
     def process(self, state: AgentState) -> AgentState:
         """Generate summary from transcript text."""
@@ -46,68 +130,435 @@ class SummarizationAgent(BaseAgent):
             state.add_error(self.agent_name, "No transcript text available")
             return state
         
+        transcript, token_count = self.prepare_transcript(state)
+        if token_count < MIN_TRANSCRIPT_TOKENS:
+            self.logger.info("Transcript has only %d tokens; skipping summarization", token_count)
+            state.summary = INSUFFICIENT_CONTENT_SUMMARY
+            return state
+        
         try:
             # Generate summary from transcript
-            summary = self._generate_summary(state.transcript_text)
+            if self._use_map_reduce(token_count):
+                summary = self._map_reduce_summary(state.transcript_text)
+            else:
+                summary = self._generate_summary(transcript)
             self.log_success(state, "Summary generation completed")
                 
             state.summary = summary
             return state
             
-        except Exception as e:
+        except (APIError, LLMResponseError) as e:
             return self.handle_error(state, e, "Summarization failed")
     
-    def _generate_summary(self, transcript: str) -> CallSummary:
-        """Generate summary using LLM."""
-        system_prompt = self._get_system_prompt()
-        human_prompt = f"Analyze this call transcript:\n\n{transcript}"
+    async def aprocess(self, state: AgentState) -> AgentState:
+        """Generate summary from transcript text without blocking the event loop."""
+        if not state.transcript_text:
+            state.add_error(self.agent_name, "No transcript text available")
+            return state
         
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=human_prompt)
-        ]
+        transcript, token_count = self.prepare_transcript(state)
+        if token_count < MIN_TRANSCRIPT_TOKENS:
+            self.logger.info("Transcript has only %d tokens; skipping summarization", token_count)
+            state.summary = INSUFFICIENT_CONTENT_SUMMARY
+            return state
         
         try:
-            response = self.llm.invoke(messages)
-            content = response.content if hasattr(response, 'content') else str(response)
+            if self._use_map_reduce(token_count):
+                summary = await self._map_reduce_summary_async(state.transcript_text)
+            else:
+                summary = await self._generate_summary_async(transcript)
+            self.log_success(state, "Summary generation completed")
+                
+            state.summary = summary
+            return state
             
-            # Use helper function for JSON parsing with fallback
-            fallback_summary = self._get_fallback_summary()
+        except (APIError, LLMResponseError) as e:
+            return self.handle_error(state, e, "Summarization failed")
+    
+    def process_batch(self, states: Sequence[AgentState]) -> List[AgentState]:
+        """
+        Summarize several calls, packing their transcripts into shared LLM requests.
+        
+        Each request carries up to DEFAULT_MAX_BATCH_SIZE transcripts and
+        BATCH_PROMPT_MAX_TOKENS tokens, trading a larger prompt for fewer
+        round-trips when the API limits requests rather than tokens.
+        
+        Args:
+            states: States to summarize
             
+        Returns:
+            The same states, updated in place
+        """
+        for group in self._batch_groups(states):
             try:
-                summary_dict = parse_llm_json_response(content)
-            except Exception as parse_error:
-                self.logger.warning(f"Using fallback summary due to: {parse_error}")
-                summary_dict = fallback_summary
+                summaries = self._invoke_and_parse_batch(self._build_batch_messages(group), len(group))
+            except (APIError, LLMResponseError, ValidationError) as e:
+                for state in group:
+                    self.handle_error(state, e, "Batch summarization failed")
+                continue
+            self._apply_batch(group, summaries)
+        return list(states)
+    
+    async def aprocess_batch(self, states: Sequence[AgentState]) -> List[AgentState]:
+        """Async counterpart of process_batch; the batched requests run concurrently."""
+        async def run(group: List[AgentState]) -> None:
+            try:
+                summaries = await self._ainvoke_and_parse_batch(self._build_batch_messages(group), len(group))
+            except (APIError, LLMResponseError, ValidationError) as e:
+                for state in group:
+                    self.handle_error(state, e, "Batch summarization failed")
+                return
+            self._apply_batch(group, summaries)
+        
+        await asyncio.gather(*(run(group) for group in self._batch_groups(states)))
+        return list(states)
+    
+    def _batch_groups(self, states: Sequence[AgentState]) -> List[List[AgentState]]:
+        """Settle the states that need no LLM call and group the rest by size and token budget."""
+        groups: List[List[AgentState]] = []
+        group: List[AgentState] = []
+        group_tokens = 0
+        for state in states:
+            if not state.transcript_text:
+                state.add_error(self.agent_name, "No transcript text available")
+                continue
+            _, token_count = self.prepare_transcript(state)
+            if token_count < MIN_TRANSCRIPT_TOKENS:
+                state.summary = INSUFFICIENT_CONTENT_SUMMARY
+                continue
             
-            return CallSummary(**summary_dict)
-                
-        except Exception as e:
+            token_count = min(token_count, get_config().model.max_prompt_tokens)
+            if group and (len(group) >= DEFAULT_MAX_BATCH_SIZE or group_tokens + token_count > BATCH_PROMPT_MAX_TOKENS):
+                groups.append(group)
+                group, group_tokens = [], 0
+            group.append(state)
+            group_tokens += token_count
+        if group:
+            groups.append(group)
+        return groups
+    
+    def _apply_batch(self, group: List[AgentState], summaries: List[CallSummary]) -> None:
+        """Store each summary on its state."""
+        for state, summary in zip(group, summaries):
+            state.summary = summary
+            self.log_success(state, "Batch summary generation completed")
+    
+    @llm_retry(ValidationError, LLMResponseError)
+    def _invoke_and_parse_batch(self, messages: list, expected: int) -> List[CallSummary]:
+        """Call the LLM once for a group, retrying transient errors and invalid output."""
+        return self._parse_batch_response(self._batch_llm.invoke(messages), expected)
+    
+    @llm_retry(ValidationError, LLMResponseError)
+    async def _ainvoke_and_parse_batch(self, messages: list, expected: int) -> List[CallSummary]:
+        """Async counterpart of _invoke_and_parse_batch."""
+        return self._parse_batch_response(await self._batch_llm.ainvoke(messages), expected)
+    
+    async def astream_summary(self, state: AgentState) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a call's summary, yielding its fields as they are generated.
+        
+        Each item holds every field completed so far, so consumers can act on
+        sentiment/outcome before the summary text finishes. Uses the same
+        caches and model cascade as aprocess: a cached summary is yielded
+        whole, and if a model's output is invalid or empty the stream starts
+        over with the next model's fields. The validated summary is stored on
+        the state; on failure the error is recorded there and the stream ends.
+        
+        Args:
+            state: State with transcript_text set
+            
+        Yields:
+            Growing dicts of completed CallSummary fields
+        """
+        if not state.transcript_text:
+            state.add_error(self.agent_name, "No transcript text available")
+            return
+        
+        transcript, token_count = self.prepare_transcript(state)
+        if token_count < MIN_TRANSCRIPT_TOKENS:
+            state.summary = INSUFFICIENT_CONTENT_SUMMARY
+            yield state.summary.model_dump()
+            return
+        
+        try:
+            messages, key, cached = await self._alookup_summary(transcript)
+            if cached:
+                self.logger.debug("Summary cache hit")
+                state.summary = cached
+            else:
+                summary = None
+                for model, llm in self._llm_cascade:
+                    parts = []
+                    emitted = 0
+                    async with aclosing(llm.astream(messages)) as stream:
+                        async for chunk in stream:
+                            parts.append(chunk.content)
+                            fields = self._completed_fields("".join(parts))
+                            if len(fields) > emitted:
+                                emitted = len(fields)
+                                yield fields
+                    candidate, done = self._judge_tier(model, "".join(parts))
+                    if candidate is not None:
+                        summary = candidate
+                    if done:
+                        break
+                state.summary = self._settle_cascade(summary)
+                await self._astore_summary(key, transcript, state.summary)
+        
+        except (APIError, LLMResponseError) as e:
+            self.handle_error(state, e, "Summarization failed")
+            return
+        
+        self.log_success(state, "Summary generation completed")
+        yield state.summary.model_dump()
+    
+    def _generate_summary(self, transcript: str) -> CallSummary:
+        """Generate summary using LLM."""
+        messages, key, cached = self._lookup_exact(transcript)
+        if cached is None and self.semantic_cache:
+            cached = self.semantic_cache.get(transcript)
+        if cached:
+            return self._cached_summary(cached)
+        
+        # API errors propagate as-is; invalid or empty output escalates to the next model
+        summary = None
+        for model, llm in self._llm_cascade:
+            candidate, done = self._judge_tier(model, self._invoke_llm(llm, messages))
+            if candidate is not None:
+                summary = candidate
+            if done:
+                break
+        
+        summary = self._settle_cascade(summary)
+        self._exact_cache.put(key, summary)
+        if self.semantic_cache:
+            self.semantic_cache.put(transcript, summary)
+        return summary
+    
+    async def _generate_summary_async(self, transcript: str) -> CallSummary:
+        """Async counterpart of _generate_summary using the LLM's native ainvoke."""
+        messages, key, cached = await self._alookup_summary(transcript)
+        if cached:
+            return self._cached_summary(cached)
+        
+        # API errors propagate as-is; invalid or empty output escalates to the next model
+        summary = None
+        for model, llm in self._llm_cascade:
+            candidate, done = self._judge_tier(model, await self._ainvoke_llm(llm, messages))
+            if candidate is not None:
+                summary = candidate
+            if done:
+                break
+        
+        summary = self._settle_cascade(summary)
+        await self._astore_summary(key, transcript, summary)
+        return summary
+    
+    def _lookup_exact(self, transcript: str) -> Tuple[list, str, Optional[CallSummary]]:
+        """Build the prompt for a transcript and look it up in the exact-match cache."""
+        messages = self._build_messages(transcript)
+        key = self._exact_cache.key(messages, model=self.model_name, temperature=self.temperature)
+        return messages, key, self._exact_cache.get(key)
+    
+    async def _alookup_summary(self, transcript: str) -> Tuple[list, str, Optional[CallSummary]]:
+        """Like _lookup_exact, falling back to the semantic cache on a miss."""
+        messages, key, cached = self._lookup_exact(transcript)
+        # Embedding is CPU-bound, so semantic lookups run off the event loop
+        if cached is None and self.semantic_cache:
+            cached = await asyncio.to_thread(self.semantic_cache.get, transcript)
+        return messages, key, cached
+    
+    async def _astore_summary(self, key: str, transcript: str, summary: CallSummary) -> None:
+        """Cache a generated summary in both the exact-match and semantic caches."""
+        self._exact_cache.put(key, summary)
+        if self.semantic_cache:
+            await asyncio.to_thread(self.semantic_cache.put, transcript, summary)
+    
+    def _judge_tier(self, model: str, response) -> Tuple[Optional[CallSummary], bool]:
+        """Parse one cascade tier's response; returns the summary (None if invalid) and whether to stop."""
+        try:
+            summary = self._parse_summary_response(response)
+        except ValidationError as e:
+            self.logger.warning("Invalid summary from %s: %s", model, e)
+            return None, False
+        if not summary.summary.strip():
+            self.logger.info("Empty summary from %s", model)
+            return summary, False
+        return summary, True
+    
+    @staticmethod
+    def _settle_cascade(summary: Optional[CallSummary]) -> CallSummary:
+        """Return the cascade's summary, failing if no model produced a valid one."""
+        if summary is None:
+            raise LLMResponseError("Failed to generate summary: no model returned a valid summary")
+        return summary
+    
+    @staticmethod
+    def _use_map_reduce(token_count: int) -> bool:
+        """Whether a transcript should be summarized in parts rather than truncated."""
+        config = get_config()
+        return config.model.map_reduce_summaries and token_count > config.model.max_prompt_tokens
+    
+    def _map_reduce_summary(self, transcript: str) -> CallSummary:
+        """Summarize a long transcript in windows concurrently, then summarize the summaries."""
+        chunks = split_to_token_budget(transcript, self.model_name, MAP_REDUCE_CHUNK_TOKENS)
+        self.logger.info("Summarizing long transcript in %d parts", len(chunks))
+        
+        try:
+            # A private pool: the shared one may already be running this call
+            with ThreadPoolExecutor(max_workers=min(len(chunks), get_config().model.max_concurrency)) as pool:
+                partials = list(pool.map(self._summarize_part, chunks))
+            return self._invoke_and_parse(self._build_reduce_messages(partials))
+        except ValidationError as e:
             raise LLMResponseError(f"Failed to generate summary: {str(e)}")
     
+    async def _map_reduce_summary_async(self, transcript: str) -> CallSummary:
+        """Async counterpart of _map_reduce_summary."""
+        chunks = split_to_token_budget(transcript, self.model_name, MAP_REDUCE_CHUNK_TOKENS)
+        self.logger.info("Summarizing long transcript in %d parts", len(chunks))
+        
+        semaphore = asyncio.Semaphore(get_config().model.max_concurrency)
+        
+        async def summarize(chunk: str) -> CallSummary:
+            async with semaphore:
+                return await self._asummarize_part(chunk)
+        
+        try:
+            partials = await asyncio.gather(*(summarize(chunk) for chunk in chunks))
+            return await self._ainvoke_and_parse(self._build_reduce_messages(partials))
+        except ValidationError as e:
+            raise LLMResponseError(f"Failed to generate summary: {str(e)}")
     
+    @llm_retry()
+    def _summarize_part(self, chunk: str) -> CallSummary:
+        """Summarize one window of a long call; partial fields are only reported for the final summary."""
+        return self._parse_summary_response(self.llm.invoke(self._build_messages(chunk)))
+    
+    @llm_retry()
+    async def _asummarize_part(self, chunk: str) -> CallSummary:
+        """Async counterpart of _summarize_part."""
+        return self._parse_summary_response(await self.llm.ainvoke(self._build_messages(chunk)))
+    
+    def _cached_summary(self, summary: CallSummary) -> CallSummary:
+        """Return a cached summary, reporting it to on_partial as one complete update."""
+        self.logger.debug("Summary cache hit")
+        if self.on_partial:
+            self.on_partial(summary.model_dump())
+        return summary
+    
+    def _invoke_and_parse(self, messages: list, llm=None) -> CallSummary:
+        """Call an LLM (the first in the cascade by default) and parse its summary."""
+        return self._parse_summary_response(self._invoke_llm(llm or self.llm, messages))
+    
+    async def _ainvoke_and_parse(self, messages: list, llm=None) -> CallSummary:
+        """Async counterpart of _invoke_and_parse."""
+        return self._parse_summary_response(await self._ainvoke_llm(llm or self.llm, messages))
+    
+    # Invalid output isn't retried here; it escalates to the next model instead
+    @llm_retry()
+    def _invoke_llm(self, llm, messages: list):
+        """Call an LLM and return its response, retrying transient errors."""
+        if self.on_partial:
+            return self._stream_content(llm, messages)
+        return llm.invoke(messages)
+    
+    @llm_retry()
+    async def _ainvoke_llm(self, llm, messages: list):
+        """Async counterpart of _invoke_llm."""
+        if self.on_partial:
+            return await self._astream_content(llm, messages)
+        return await llm.ainvoke(messages)
+    
+    def _stream_content(self, llm, messages: list) -> str:
+        """Stream the response, reporting fields to on_partial as they complete."""
+        parts = []
+        emitted = 0
+        for chunk in llm.stream(messages):
+            parts.append(chunk.content)
+            emitted = self._emit_completed_fields("".join(parts), emitted)
+        content = "".join(parts)
+        self._emit_completed_fields(content, emitted, final=True)
+        return content
+    
+    async def _astream_content(self, llm, messages: list) -> str:
+        """Async counterpart of _stream_content."""
+        parts = []
+        emitted = 0
+        async for chunk in llm.astream(messages):
+            parts.append(chunk.content)
+            emitted = self._emit_completed_fields("".join(parts), emitted)
+        content = "".join(parts)
+        self._emit_completed_fields(content, emitted, final=True)
+        return content
+    
+    def _emit_completed_fields(self, content: str, emitted: int, final: bool = False) -> int:
+        """Report the fields parsed so far, once more of them are complete."""
+        fields = self._completed_fields(content, final)
+        if len(fields) > emitted:
+            self.on_partial(fields)
+            return len(fields)
+        return emitted
     
     @staticmethod
-    def _get_system_prompt() -> str:
-        """Get the basic system prompt for summarization."""
-        return """You are a call center analyst. Create a structured summary of this call transcript.
-
-Respond in JSON format only. Do not use code blocks, backticks, or any markdown formatting. Your response must be pure JSON that starts with { and ends with }:
-{
-    "summary": "Brief executive summary (1-2 sentences)",
-    "key_points": ["List of 3-5 key discussion points"],
-    "sentiment": "positive|neutral|negative", 
-    "outcome": "resolved|escalated|follow_up|unresolved"
-}"""
+    def _completed_fields(content: str, final: bool = False) -> Dict[str, Any]:
+        """Parse the fields of a partial JSON response that are fully received."""
+        try:
+            partial = parse_partial_json(content)
+        except ValueError:
+            return {}
+        if not isinstance(partial, dict):
+            return {}
+        
+        # The last key may still be streaming unless the response is finished
+        return dict(partial.items()) if final else dict(list(partial.items())[:-1])
     
+    def _build_messages(self, transcript: str) -> list:
+        """Build the summarization prompt for a transcript."""
+        human_prompt = f"{SUMMARY_HUMAN_PREFIX}{transcript}"
+        
+        return [
+            SUMMARY_SYSTEM_MSG,
+            HumanMessage(content=human_prompt)
+        ]
     
+    def _build_batch_messages(self, group: List[AgentState]) -> list:
+        """Build one prompt holding a group's numbered transcripts."""
+        transcripts = "\n\n".join(
+            f"<<TRANSCRIPT {i}>>\n{state.prompt_transcript}" for i, state in enumerate(group, 1)
+        )
+        human_prompt = f"Summarize each of the {len(group)} call transcripts below.\n\n{transcripts}"
+        
+        return [
+            BATCH_SUMMARY_SYSTEM_MSG,
+            HumanMessage(content=human_prompt)
+        ]
     
     @staticmethod
-    def _get_fallback_summary() -> dict:
-        """Get a fallback summary structure."""
-        return {
-            "summary": "Unable to process transcript.",
-            "key_points": ["Failed to process transcript."],
-            "sentiment": "unknown",
-            "outcome": "unknown"
-        }
\ No newline at end of file
+    def _parse_batch_response(response, expected: int) -> List[CallSummary]:
+        """Parse a batched response, checking there is one summary per transcript."""
+        content = response.content if hasattr(response, 'content') else str(response)
+        summaries = _SummaryBatch.model_validate_json(content).summaries
+        if len(summaries) != expected:
+            raise LLMResponseError(f"Expected {expected} summaries, got {len(summaries)}")
+        return summaries
+    
+    def _build_reduce_messages(self, partials: List[CallSummary]) -> list:
+        """Build the prompt that merges partial summaries, in call order."""
+        parts = "\n\n".join(
+            f"PART {i}:\n{partial.model_dump_json()}" for i, partial in enumerate(partials, 1)
+        )
+        
+        return [
+            SUMMARY_SYSTEM_MSG,
+            HumanMessage(content=f"{SUMMARY_REDUCE_HUMAN_PREFIX}{parts}")
+        ]
+    
+    def _parse_summary_response(self, response) -> CallSummary:
+        """Parse an LLM response into a CallSummary."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        cached_tokens = usage.get("input_token_details", {}).get("cache_read", 0)
+        if cached_tokens:
+            self.logger.debug("Prompt cache hit: %d of %d input tokens", cached_tokens, usage["input_tokens"])
+        
+        content = response.content if hasattr(response, 'content') else str(response)
+        return CallSummary.model_validate_json(content)
\ No newline at end of file
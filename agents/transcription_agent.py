@@ -2,26 +2,55 @@
 Simplified Transcription Agent - Converts audio to text using OpenAI Whisper API.
 """
 
-import logging
+import asyncio
+import hashlib
 import os
-import tempfile
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
 
-from openai import OpenAI
+import orjson
 
+from agents.base_agent import BaseAgent
+from config.settings import get_config
+from utils.audio import preprocess_audio, split_audio, trim_silence
+from utils.cache import ExactMatchCache
+from utils.clients import get_async_openai_client, get_openai_client, llm_retry
+from utils.constants import (
+    AUDIO_PREPROCESS_TIMEOUT_S,
+    CHUNKED_TRANSCRIPTION_MIN_MS,
+    TRANSCRIPTION_CHUNK_MS,
+    VAD_AGGRESSIVENESS,
+    VAD_FRAME_MS,
+    VAD_PADDING_MS,
+)
 from utils.validation import AgentState, InputType
 
-logger = logging.getLogger(__name__)
+# Audio arrives in memory (UI uploads) or as a path the SDK reads at upload time (CLI)
+AudioSource = Union[bytes, Path]
 
 
-class TranscriptionAgent:
+class TranscriptionAgent(BaseAgent):
     """Simplified agent for converting audio to text using OpenAI Whisper."""
     
-    def __init__(self, openai_api_key=None):
+    def __init__(self, openai_api_key: Optional[str] = None):
+        super().__init__("transcription")
+        config = get_config()
+        
         self.openai_api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             raise ValueError("OpenAI API key is required for transcription.")
-        self.openai_client = OpenAI(api_key=self.openai_api_key)
+        # Shared clients on the pooled HTTP/2 connections the LLM agents use
+        self.openai_client = get_openai_client(self.openai_api_key)
+        self.async_openai_client = get_async_openai_client(self.openai_api_key)
+        
+        # Content-addressed transcripts, so replays of the same audio skip Whisper:
+        # an in-process LRU in front of an optional on-disk store
+        self._memory_cache: ExactMatchCache[str] = ExactMatchCache(config.model.transcription_cache_size)
+        self.cache_dir: Optional[Path] = None
+        if config.model.transcription_cache_dir:
+            self.cache_dir = Path(config.model.transcription_cache_dir).expanduser()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
     
     def process(self, state: AgentState) -> AgentState:
         """Process audio input and convert to text using Whisper."""
@@ -33,43 +62,224 @@ class TranscriptionAgent:
         
         try:
             # Transcribe audio using Whisper
-            transcript_text = self._transcribe_audio(state.input_data.content)
-            state.transcript_text = transcript_text
-            logger.info(f"Transcription completed for call {state.call_id}")
-            
+            state.transcript_text = self._transcribe_audio(state.input_data.content, state.input_data.file_name)
+            self.log_success(state, "Transcription completed")
+        
         except Exception as e:
-            logger.error(f"Transcription failed: {str(e)}")
-            state.add_error("transcription", str(e))
+            self.handle_error(state, e, "Transcription failed")
         
         return state
     
-    def _transcribe_audio(self, audio_content: bytes) -> str:
-        """Transcribe audio using OpenAI Whisper API."""
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp_file:
-            tmp_file.write(audio_content)
-            tmp_file_path = tmp_file.name
+    async def aprocess(self, state: AgentState) -> AgentState:
+        """Process audio input without blocking the event loop, so many calls can upload at once."""
+        if state.input_data.input_type != InputType.AUDIO:
+            if isinstance(state.input_data.content, str):
+                state.transcript_text = state.input_data.content
+            return state
         
         try:
-            logger.info("Starting Whisper transcription")
-            
-            with open(tmp_file_path, "rb") as audio_file:
-                transcript = self.openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file
-                )
-            
-            transcript_text = transcript.text
-            
-            if not transcript_text:
-                raise ValueError("No transcript text returned from Whisper")
-                
-            logger.info(f"Transcription completed: {len(transcript_text)} characters")
-            return transcript_text
-            
+            state.transcript_text = await self._transcribe_audio_async(
+                state.input_data.content, state.input_data.file_name
+            )
+            self.log_success(state, "Transcription completed")
+        
         except Exception as e:
-            logger.error(f"Whisper transcription failed: {str(e)}")
-            raise e
+            self.handle_error(state, e, "Transcription failed")
+        
+        return state
+    
+    def _transcribe_audio(self, audio_content: AudioSource, file_name: Optional[str] = None) -> str:
+        """Transcribe audio using OpenAI Whisper API."""
+        cache_key = self._cache_key(audio_content)
+        cached = self._memory_cache.get(cache_key)
+        if cached:
+            self.logger.info("Transcription served from memory cache")
+            return cached
+        cache_path = self._cache_path(cache_key)
+        cached = self._read_cache(cache_path)
+        if cached:
+            self._memory_cache.put(cache_key, cached)
+            return cached
+        
+        audio_content, file_name = self._trim_silence(audio_content, file_name)
+        audio_content, file_name = self._preprocess_audio(audio_content, file_name)
+        chunks = self._split_audio(audio_content, file_name)
+        if chunks:
+            self.logger.info("Starting Whisper transcription of %d chunks", len(chunks))
+            # A private pool: the shared one may already be running this call
+            with ThreadPoolExecutor(
+                max_workers=min(len(chunks), get_config().model.transcription_max_concurrency)
+            ) as pool:
+                transcript_text = self._transcript_text(" ".join(pool.map(self._request_transcript, chunks)))
+        else:
+            self.logger.info("Starting Whisper transcription")
+            transcript_text = self._transcript_text(self._request_transcript(audio_content, file_name))
+        
+        self._memory_cache.put(cache_key, transcript_text)
+        self._write_cache(cache_path, transcript_text)
+        return transcript_text
+    
+    async def _transcribe_audio_async(self, audio_content: AudioSource, file_name: Optional[str] = None) -> str:
+        """Async counterpart of _transcribe_audio; hashing, cache file I/O and audio processing run off the event loop."""
+        cache_key = await asyncio.to_thread(self._cache_key, audio_content)
+        cached = self._memory_cache.get(cache_key)
+        if cached:
+            self.logger.info("Transcription served from memory cache")
+            return cached
+        cache_path = self._cache_path(cache_key)
+        cached = await asyncio.to_thread(self._read_cache, cache_path)
+        if cached:
+            self._memory_cache.put(cache_key, cached)
+            return cached
+        
+        audio_content, file_name = await asyncio.to_thread(self._trim_silence, audio_content, file_name)
+        audio_content, file_name = await asyncio.to_thread(self._preprocess_audio, audio_content, file_name)
+        chunks = await asyncio.to_thread(self._split_audio, audio_content, file_name)
+        if chunks:
+            self.logger.info("Starting Whisper transcription of %d chunks", len(chunks))
+            semaphore = asyncio.Semaphore(get_config().model.transcription_max_concurrency)
+            
+            async def transcribe(chunk: bytes) -> str:
+                async with semaphore:
+                    return await self._arequest_transcript(chunk)
             
-        finally:
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
\ No newline at end of file
+            # gather keeps the chunks in call order
+            parts = await asyncio.gather(*(transcribe(chunk) for chunk in chunks))
+            transcript_text = self._transcript_text(" ".join(parts))
+        else:
+            self.logger.info("Starting Whisper transcription")
+            transcript_text = self._transcript_text(await self._arequest_transcript(audio_content, file_name))
+        
+        self._memory_cache.put(cache_key, transcript_text)
+        await asyncio.to_thread(self._write_cache, cache_path, transcript_text)
+        return transcript_text
+    
+    @llm_retry()
+    def _request_transcript(self, audio_content: AudioSource, file_name: Optional[str] = None) -> str:
+        """Send one Whisper request and return its text, retrying transient errors."""
+        # Plain-text responses skip building and parsing a JSON body we'd only read .text from
+        transcript = self.openai_client.audio.transcriptions.create(
+            model=get_config().model.transcription_model,
+            file=self._upload_file(audio_content, file_name),
+            response_format="text"
+        )
+        return transcript.strip()
+    
+    @llm_retry()
+    async def _arequest_transcript(self, audio_content: AudioSource, file_name: Optional[str] = None) -> str:
+        """Async counterpart of _request_transcript."""
+        transcript = await self.async_openai_client.audio.transcriptions.create(
+            model=get_config().model.transcription_model,
+            file=self._upload_file(audio_content, file_name),
+            response_format="text"
+        )
+        return transcript.strip()
+    
+    def _trim_silence(self, audio_content: AudioSource, file_name: Optional[str]) -> Tuple[AudioSource, Optional[str]]:
+        """Cut hold music and dead air before upload, when enabled, keeping the original on failure."""
+        if not get_config().model.trim_silence:
+            return audio_content, file_name
+        trimmed = trim_silence(
+            self._audio_bytes(audio_content), file_name, VAD_FRAME_MS, VAD_PADDING_MS, VAD_AGGRESSIVENESS
+        )
+        if trimmed is None:
+            return audio_content, file_name
+        return trimmed, "audio.mp3"
+    
+    def _preprocess_audio(self, audio_content: AudioSource, file_name: Optional[str]) -> Tuple[AudioSource, Optional[str]]:
+        """Shrink the upload to 16 kHz mono MP3 (sped up if configured), keeping the original on failure."""
+        if not get_config().model.preprocess_audio:
+            return audio_content, file_name
+        original = self._audio_bytes(audio_content)
+        processed = preprocess_audio(original, get_config().model.audio_speedup, AUDIO_PREPROCESS_TIMEOUT_S)
+        if processed is None:
+            return audio_content, file_name
+        self.logger.info("Preprocessed audio: %d -> %d bytes", len(original), len(processed))
+        return processed, "audio.mp3"
+    
+    @classmethod
+    def _split_audio(cls, audio_content: AudioSource, file_name: Optional[str]) -> Optional[List[bytes]]:
+        """Split long audio into ~30 s chunks to transcribe concurrently, when enabled."""
+        if not get_config().model.chunked_transcription:
+            return None
+        return split_audio(
+            cls._audio_bytes(audio_content), file_name, TRANSCRIPTION_CHUNK_MS, CHUNKED_TRANSCRIPTION_MIN_MS
+        )
+    
+    @staticmethod
+    def _audio_bytes(audio_content: AudioSource) -> bytes:
+        """Load audio given as a path; only needed when it has to be decoded locally."""
+        return audio_content.read_bytes() if isinstance(audio_content, Path) else audio_content
+    
+    @staticmethod
+    def _cache_key(audio_content: AudioSource) -> str:
+        """
+        Identify a transcript by the audio's SHA-256, the model and the preprocessing
+        that changes what Whisper hears; files are hashed in blocks.
+        """
+        if isinstance(audio_content, Path):
+            with audio_content.open("rb") as audio_file:
+                digest = hashlib.file_digest(audio_file, "sha256").hexdigest()
+        else:
+            digest = hashlib.sha256(audio_content).hexdigest()
+        config = get_config()
+        key = f"{digest}-{config.model.transcription_model}"
+        if config.model.trim_silence:
+            key += f"-vad{VAD_AGGRESSIVENESS}p{VAD_PADDING_MS}"
+        if config.model.preprocess_audio:
+            key += f"-pre{config.model.audio_speedup:g}x"
+        return key
+    
+    def _cache_path(self, cache_key: str) -> Optional[Path]:
+        """Locate the on-disk cache entry for a key, if disk caching is enabled."""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{cache_key}.json"
+    
+    def _read_cache(self, path: Optional[Path]) -> Optional[str]:
+        """Return a cached transcript, if present and readable."""
+        if path is None or not path.exists():
+            return None
+        try:
+            transcript_text = orjson.loads(path.read_bytes())["text"]
+        except (OSError, orjson.JSONDecodeError, KeyError) as e:
+            self.logger.warning("Ignoring unreadable transcription cache entry %s: %s", path, e)
+            return None
+        self.logger.info("Transcription served from cache: %s", path.name)
+        return transcript_text
+    
+    def _write_cache(self, path: Optional[Path], transcript_text: str) -> None:
+        """Store a transcript; written to a temp file first so readers never see a partial entry."""
+        if path is None:
+            return
+        try:
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(orjson.dumps({"text": transcript_text}))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning("Could not write transcription cache entry %s: %s", path, e)
+    
+    @staticmethod
+    def _upload_file(audio_content: AudioSource, file_name: Optional[str]) -> Tuple[str, AudioSource]:
+        """
+        Wrap audio for upload, with no temp-file round-trip.
+        
+        Whisper infers the audio format from the file extension, so the
+        original name is kept when known. Paths are read by the SDK only
+        while the request is sent, so the bytes aren't held for the whole call.
+        """
+        if file_name:
+            name = os.path.basename(file_name)
+        elif isinstance(audio_content, Path):
+            name = audio_content.name
+        else:
+            name = "audio.mp3"
+        return (name, audio_content)
+    
+    def _transcript_text(self, transcript_text: str) -> str:
+        """Check the text Whisper returned for a call."""
+        if not transcript_text:
+            raise ValueError("No transcript text returned from Whisper")
+        
+        self.logger.info("Transcription completed: %d characters", len(transcript_text))
+        return transcript_text
@@ -7,13 +7,12 @@ import os
 import sys
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
+import orjson
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 
 class ModelProvider(str, Enum):
     """Supported LLM providers."""
@@ -77,17 +76,37 @@ class APIConfig:
 class ModelConfig:
     """Model configuration settings."""
     # LLM settings
-    llm_model: str = "gpt-4-turbo-preview"
+    llm_model: str = "gpt-4o-mini"
     llm_temperature: float = 0
     llm_provider: ModelProvider = ModelProvider.OPENAI
     
     # Transcription settings
     transcription_model: str = "whisper-1"
     transcription_provider: TranscriptionProvider = TranscriptionProvider.WHISPER
+    transcription_cache_size: int = 128  # Transcripts of recent audio kept in memory
+    transcription_cache_dir: Optional[str] = None  # Reuse transcripts of identical audio across runs when set
+    chunked_transcription: bool = False  # Transcribe long audio in 30 s chunks concurrently (needs the audio extra)
+    transcription_max_concurrency: int = 5  # In-flight Whisper requests per call when chunking
+    trim_silence: bool = False  # Drop non-speech audio before upload (needs the audio extra)
+    preprocess_audio: bool = False  # Re-encode uploads as 16 kHz mono MP3 with ffmpeg
+    audio_speedup: float = 1.0  # Tempo applied while preprocessing; >1 shortens billed minutes
+    
+    # Prompt budgeting
+    max_prompt_tokens: int = 8000  # Transcript tokens per request; longer calls are truncated
+    map_reduce_summaries: bool = False  # Summarize over-budget calls in chunks instead of truncating
     
     # Retry settings
     max_retries: int = 2
     retry_delay: float = 1.0
+    
+    # Concurrency settings
+    max_concurrency: int = 8  # In-flight LLM requests; keep within the provider's rate tier
+    http_pool_size: int = 100  # Shared OpenAI HTTP connection pool
+    agent_workers: int = 16  # Threads for sync batch processing
+    
+    # Result caching
+    semantic_cache: bool = False  # Reuse results for identical/near-duplicate transcripts
+    semantic_cache_path: Optional[str] = None  # Persist the cache here when set
 
 
 @dataclass
@@ -98,6 +117,7 @@ class AppConfig:
     
     # Logging
     log_level: str = "INFO"
+    log_json: bool = False
     enable_langsmith: bool = False
     
     @classmethod
@@ -113,19 +133,74 @@ class AppConfig:
         
         return cls(
             api=api_config,
-            model=ModelConfig(),
+            model=ModelConfig(
+                max_prompt_tokens=int(os.getenv("MAX_PROMPT_TOKENS", "8000")),
+                map_reduce_summaries=os.getenv("MAP_REDUCE_SUMMARIES", "").lower() in ("1", "true", "yes"),
+                http_pool_size=int(os.getenv("OPENAI_POOL", "100")),
+                agent_workers=int(os.getenv("AGENT_WORKERS", "16")),
+                semantic_cache=os.getenv("SEMANTIC_CACHE", "").lower() in ("1", "true", "yes"),
+                semantic_cache_path=os.getenv("SEMANTIC_CACHE_PATH") or None,
+                transcription_cache_size=int(os.getenv("TRANSCRIPTION_CACHE_SIZE", "128")),
+                transcription_cache_dir=os.getenv("TRANSCRIPTION_CACHE_DIR") or None,
+                chunked_transcription=os.getenv("CHUNKED_TRANSCRIPTION", "").lower() in ("1", "true", "yes"),
+                transcription_max_concurrency=int(os.getenv("TRANSCRIPTION_CONCURRENCY", "5")),
+                trim_silence=os.getenv("TRIM_SILENCE", "").lower() in ("1", "true", "yes"),
+                preprocess_audio=os.getenv("PREPROCESS_AUDIO", "").lower() in ("1", "true", "yes"),
+                audio_speedup=float(os.getenv("AUDIO_SPEEDUP", "1.0"))
+            ),
             log_level=os.getenv("LOG_LEVEL", "INFO"),
+            log_json=os.getenv("LOG_JSON", "").lower() in ("1", "true", "yes"),
             enable_langsmith=enable_langsmith
         )
 
 
-# Global configuration instance
-config = AppConfig.from_env()
+@lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    """Load .env and build the configuration once, on first use."""
+    load_dotenv()
+    return AppConfig.from_env()
+
+
+def __getattr__(name: str):
+    """Resolve the global `config` instance lazily (PEP 562)."""
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Set by the first setup_logging() call
+_logging_configured = False
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Render log records as single-line JSON for log aggregation."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
 
 
 def setup_logging() -> None:
-    """Configure logging for console output with proper formatting."""
-    from utils.constants import LOG_FORMAT, LOG_DATE_FORMAT
+    """
+    Configure logging for console output with proper formatting.
+    
+    Idempotent: Streamlit re-runs the app script on every interaction, so
+    only the first call installs the handler.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    
+    from utils.constants import LOG_FORMAT, LOG_DATE_FORMAT, QUIET_LOGGERS
+    
+    config = get_config()
     
     # Get log level from config
     log_level = getattr(logging, config.log_level.upper(), logging.INFO)
@@ -139,10 +214,13 @@ def setup_logging() -> None:
     console_handler.setLevel(log_level)
     
     # Create formatter
-    formatter = logging.Formatter(
-        fmt=LOG_FORMAT,
-        datefmt=LOG_DATE_FORMAT
-    )
+    if config.log_json:
+        formatter = JsonLogFormatter(datefmt=LOG_DATE_FORMAT)
+    else:
+        formatter = logging.Formatter(
+            fmt=LOG_FORMAT,
+            datefmt=LOG_DATE_FORMAT
+        )
     console_handler.setFormatter(formatter)
     
     # Configure root logger
@@ -150,13 +228,11 @@ def setup_logging() -> None:
     root_logger.addHandler(console_handler)
     
     # Suppress overly verbose third-party logs
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("httpcore").setLevel(logging.WARNING)
-    logging.getLogger("openai").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("requests").setLevel(logging.WARNING)
-    logging.getLogger("langsmith").setLevel(logging.WARNING)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    
+    _logging_configured = True
     
     # Log startup message
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging configured at {config.log_level} level")
\ No newline at end of file
+    logger.info("Logging configured at %s level", config.log_level)
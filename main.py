@@ -3,23 +3,30 @@
 Simplified CLI for AI Call Center Assistant.
 """
 
-import json
+import asyncio
 import os
 import sys
 from pathlib import Path
+from typing import List, Optional
 
-from dotenv import load_dotenv
-from utils.validation import CallInput, InputType
+from config.settings import get_config
+from utils.constants import AUDIO_EXTENSIONS, STATUS_SUCCESS, TEXT_EXTENSIONS
+from utils.validation import CallInput, InputType, ProcessingResult
 from workflow import CallCenterWorkflow
 
-# Load environment variables
-load_dotenv()
-
 # Configure logging
 from config.settings import setup_logging
 setup_logging()
 
 
+def load_call_input(path: Path) -> CallInput:
+    """Build the workflow input for a file, by extension: audio or a text transcript."""
+    if path.suffix.lower().lstrip(".") in AUDIO_EXTENSIONS:
+        # Read by the OpenAI SDK at upload time, not held for the whole call
+        return CallInput(input_type=InputType.AUDIO, content=path, file_name=path.name)
+    return CallInput(input_type=InputType.TRANSCRIPT, content=path.read_text(), file_name=path.name)
+
+
 def process_file(file_path: str) -> None:
     """Process a single file."""
     try:
@@ -29,20 +36,7 @@ def process_file(file_path: str) -> None:
             print(f"❌ File not found: {file_path}")
             return
         
-        # Determine input type and load content
-        if path.suffix.lower() in ['.mp3', '.wav', '.m4a']:
-            input_type = InputType.AUDIO
-            content = path.read_bytes()
-        else:
-            input_type = InputType.TRANSCRIPT  
-            content = path.read_text()
-        
-        # Create input
-        call_input = CallInput(
-            input_type=input_type,
-            content=content,
-            file_name=path.name
-        )
+        call_input = load_call_input(path)
         
         # Create workflow and process
         workflow = CallCenterWorkflow(
@@ -85,12 +79,67 @@ def process_file(file_path: str) -> None:
         print(f"❌ Processing failed: {str(e)}")
 
 
+def process_batch(dir_path: str, concurrency: Optional[int] = None) -> None:
+    """Process every supported file in a directory concurrently with one workflow."""
+    concurrency = concurrency or get_config().model.max_concurrency
+    directory = Path(dir_path)
+    if not directory.is_dir():
+        print(f"❌ Directory not found: {dir_path}")
+        return
+    
+    paths = sorted(
+        path for path in directory.iterdir()
+        if path.is_file() and path.suffix.lower().lstrip(".") in AUDIO_EXTENSIONS | TEXT_EXTENSIONS
+    )
+    if not paths:
+        print(f"❌ No audio or transcript files in {dir_path}")
+        return
+    
+    # One workflow, client pool and event loop for the whole batch
+    workflow = CallCenterWorkflow(
+        openai_api_key=os.getenv("OPENAI_API_KEY")
+    )
+    results = asyncio.run(_run_batch(workflow, paths, concurrency))
+    
+    for path, result in zip(paths, results):
+        icon = "✅" if result.status == STATUS_SUCCESS else "⚠️"
+        line = f"{icon} {path.name}: {result.status} in {result.processing_time_seconds:.1f}s"
+        if result.summary:
+            line += f" | {result.summary.sentiment}, {result.summary.outcome}"
+        if result.quality_score:
+            line += (
+                f" | tone {result.quality_score.tone_score:.1f}"
+                f", prof {result.quality_score.professionalism_score:.1f}"
+                f", res {result.quality_score.resolution_score:.1f}"
+            )
+        if result.errors:
+            line += f" | {result.errors[-1]['agent']}: {result.errors[-1]['error']:.100}"
+        print(line)
+    
+    succeeded = sum(result.status == STATUS_SUCCESS for result in results)
+    print(f"\n{succeeded}/{len(results)} calls processed successfully")
+
+
+async def _run_batch(
+    workflow: CallCenterWorkflow, paths: List[Path], concurrency: int
+) -> List[ProcessingResult]:
+    """Run the workflow over files with at most `concurrency` calls in flight, in input order."""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run(path: Path) -> ProcessingResult:
+        async with semaphore:
+            call_input = await asyncio.to_thread(load_call_input, path)
+            return await workflow.aprocess_call(call_input)
+    
+    return await asyncio.gather(*(run(path) for path in paths))
+
+
 def run_ui():
-    """Launch Streamlit UI."""
-    import subprocess
+    """Launch Streamlit UI, replacing this process rather than waiting on a child."""
+    sys.stdout.flush()
     try:
-        subprocess.run([sys.executable, "-m", "streamlit", "run", "ui/streamlit_app.py"])
-    except Exception as e:
+        os.execvp(sys.executable, [sys.executable, "-m", "streamlit", "run", "ui/streamlit_app.py"])
+    except OSError as e:
         print(f"❌ Failed to launch UI: {e}")
 
 
@@ -101,16 +150,19 @@ def show_help():
 
 Usage:
   python main.py <file>     Process a single audio file or transcript
+  python main.py --batch <dir>
+                            Process every audio file and transcript in a directory
   python main.py --ui       Launch web interface
   python main.py --help     Show this help
 
 Examples:
   python main.py data/sample_transcripts/customer_support.txt
   python main.py audio.mp3
+  python main.py --batch data/transcripts/text
   python main.py --ui
 
 Supported file types:
-  • Audio: .mp3, .wav, .m4a
+  • Audio: .mp3, .wav, .m4a, .ogg, .webm
   • Text: .txt, .json
 
 Environment variables:
@@ -130,6 +182,11 @@ def main():
         show_help()
     elif arg in ["--ui", "-u"]:
         run_ui()
+    elif arg in ["--batch", "-b"]:
+        if len(sys.argv) < 3:
+            show_help()
+            return
+        process_batch(sys.argv[2])
     else:
         # Assume it's a file path
         process_file(arg)
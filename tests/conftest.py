@@ -0,0 +1,33 @@
+"""Shared fixtures: offline configuration for every test."""
+
+import os
+
+import pytest
+from tenacity import wait_exponential_jitter
+
+# Set before any test imports config: no real key, and no LangSmith tracing
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ["LANGCHAIN_API_KEY"] = ""
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+from config.settings import get_config  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_config():
+    """Rebuild the cached configuration around each test, so env changes take effect."""
+    get_config.cache_clear()
+    yield
+    get_config.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def no_tracing(monkeypatch):
+    """Keep LangSmith tracing off; importing workflow switches it on."""
+    monkeypatch.setenv("LANGCHAIN_TRACING_V2", "false")
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    """Retry LLM calls immediately, so tests of retried failures stay fast."""
+    monkeypatch.setattr(wait_exponential_jitter, "__call__", lambda self, retry_state: 0)
@@ -0,0 +1,91 @@
+"""Scripted stand-ins for chat and embedding models, and sample LLM outputs."""
+
+import hashlib
+from typing import Any, Callable, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from agents.prompts import COMBINED_PROMPT, QUALITY_RUBRIC, SUMMARY_PROMPT
+
+SUMMARY_JSON = (
+    '{"sentiment": "positive", "outcome": "resolved", '
+    '"summary": "Customer reset their password.", "key_points": ["Password reset"]}'
+)
+SCORE_JSON = (
+    '{"tone_score": 8.0, "professionalism_score": 7.0, "resolution_score": 9.0, '
+    '"feedback": "Clear and patient."}'
+)
+COMBINED_JSON = SUMMARY_JSON[:-1] + ", " + SCORE_JSON[1:]
+TRANSCRIPT = "Agent: Thanks for calling, how can I help? Customer: I need to reset my password. " * 10
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that answers each call with ``respond(messages)`` and records the calls."""
+
+    respond: Callable[[List[BaseMessage]], str]
+    model_name: str = "gpt-4o-mini"
+    calls: List[List[BaseMessage]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        self.calls.append(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.respond(messages)))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        # Small chunks, so partial JSON arrives a few characters at a time
+        content = self._generate(messages).generations[0].message.content
+        for i in range(0, len(content), 8):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content[i:i + 8]))
+
+
+def scripted(*responses: str, model_name: str = "gpt-4o-mini") -> ScriptedChatModel:
+    """A model that returns ``responses`` in turn, repeating the last one."""
+    def respond(messages: List[BaseMessage]) -> str:
+        return responses[min(len(llm.calls), len(responses)) - 1]
+
+    llm = ScriptedChatModel(respond=respond, model_name=model_name)
+    return llm
+
+
+def by_prompt(**responses: str) -> ScriptedChatModel:
+    """A model that answers by system prompt: ``summary``, ``quality`` or ``combined``."""
+    prompts = {SUMMARY_PROMPT: "summary", QUALITY_RUBRIC: "quality", COMBINED_PROMPT: "combined"}
+    defaults = {"summary": SUMMARY_JSON, "quality": SCORE_JSON, "combined": COMBINED_JSON}
+    return ScriptedChatModel(respond=lambda messages: {**defaults, **responses}[prompts[messages[0].content]])
+
+
+class FakeEncoder:
+    """Hashed bag-of-words embeddings, standing in for a SentenceTransformer."""
+
+    dimension = 256
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts, normalize_embeddings: bool = False):
+        import numpy as np
+
+        vectors = np.zeros((len(texts), self.dimension), dtype="float32")
+        for row, text in enumerate(texts):
+            for word in text.split():
+                vectors[row, hashlib.md5(word.encode()).digest()[0]] += 1
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
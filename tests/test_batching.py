@@ -0,0 +1,104 @@
+"""Tests for dynamic micro-batching of quality scoring."""
+
+import asyncio
+import json
+
+import pytest
+from fakes import SCORE_JSON, TRANSCRIPT, ScriptedChatModel, scripted
+
+from agents.quality_score_agent import QualityScoringAgent
+from utils.batching import AsyncDynamicBatchScorer
+from utils.validation import AgentState, CallInput, InputType
+
+
+async def test_concurrent_submissions_share_one_call():
+    batches = []
+
+    async def score_batch(transcripts):
+        batches.append(transcripts)
+        return [len(t) for t in transcripts]
+
+    scorer = AsyncDynamicBatchScorer(score_batch, max_batch_size=8, batch_wait_timeout_s=0.05)
+    results = await asyncio.gather(*(scorer.submit("x" * n) for n in range(1, 5)))
+    await scorer.close()
+
+    assert results == [1, 2, 3, 4]
+    assert batches == [["x", "xx", "xxx", "xxxx"]]
+
+
+async def test_batches_respect_size_and_token_budget():
+    batches = []
+
+    async def score_batch(transcripts):
+        batches.append(transcripts)
+        return transcripts
+
+    scorer = AsyncDynamicBatchScorer(
+        score_batch, max_batch_size=3, batch_wait_timeout_s=0.05, max_batch_tokens=100
+    )
+    requests = [("a", 10), ("b", 10), ("c", 10), ("d", 60), ("e", 60)]
+    results = await asyncio.gather(*(scorer.submit(t, tokens) for t, tokens in requests))
+    await scorer.close()
+
+    assert results == ["a", "b", "c", "d", "e"]
+    assert batches == [["a", "b", "c"], ["d"], ["e"]]
+
+
+async def test_batch_error_fails_every_request():
+    async def score_batch(transcripts):
+        raise RuntimeError("boom")
+
+    scorer = AsyncDynamicBatchScorer(score_batch, batch_wait_timeout_s=0.05)
+    results = await asyncio.gather(scorer.submit("a"), scorer.submit("b"), return_exceptions=True)
+    await scorer.close()
+
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+
+
+async def test_close_cancels_batches_in_flight():
+    started = asyncio.Event()
+
+    async def score_batch(transcripts):
+        started.set()
+        await asyncio.sleep(60)
+
+    scorer = AsyncDynamicBatchScorer(score_batch, batch_wait_timeout_s=0)
+    pending = asyncio.ensure_future(scorer.submit("a"))
+    await started.wait()
+    await scorer.close()
+
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert not scorer._dispatches
+
+
+def make_state(text: str) -> AgentState:
+    return AgentState(
+        call_id="c1",
+        input_data=CallInput(input_type=InputType.TRANSCRIPT, content=text),
+        transcript_text=text
+    )
+
+
+async def test_agent_scores_a_burst_in_one_request():
+    def respond(messages):
+        count = messages[-1].content.count("<<TRANSCRIPT ")
+        return json.dumps({"scores": [json.loads(SCORE_JSON)] * count}) if count else SCORE_JSON
+
+    llm = ScriptedChatModel(respond=respond)
+    agent = QualityScoringAgent(llm=llm, enable_dynamic_batch=True, batch_wait_timeout_s=0.05)
+    states = [make_state(f"{TRANSCRIPT} Call {n}.") for n in range(3)]
+    states = await asyncio.gather(*(agent.aprocess(state) for state in states))
+
+    assert [state.quality_score.tone_score for state in states] == [8.0, 8.0, 8.0]
+    assert len(llm.calls) == 1
+    assert "<<TRANSCRIPT 3>>" in llm.calls[0][-1].content
+
+
+async def test_agent_rejects_a_short_batch_response():
+    llm = scripted(json.dumps({"scores": [json.loads(SCORE_JSON)]}))
+    agent = QualityScoringAgent(llm=llm, enable_dynamic_batch=True, batch_wait_timeout_s=0.05)
+    states = [make_state(f"{TRANSCRIPT} Call {n}.") for n in range(2)]
+    states = await asyncio.gather(*(agent.aprocess(state) for state in states))
+
+    assert all(state.quality_score is None and state.errors for state in states)
@@ -0,0 +1,33 @@
+"""Tests for the exact-match LRU result cache."""
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from utils.cache import ExactMatchCache
+
+MESSAGES = [SystemMessage(content="Summarize."), HumanMessage(content="Transcript")]
+
+
+def test_key_is_stable_and_ignores_param_order():
+    first = ExactMatchCache.key(MESSAGES, model="gpt-4o-mini", temperature=0)
+    second = ExactMatchCache.key(list(MESSAGES), temperature=0, model="gpt-4o-mini")
+
+    assert first == second
+
+
+def test_key_covers_messages_roles_and_params():
+    key = ExactMatchCache.key(MESSAGES, model="gpt-4o-mini", temperature=0)
+
+    assert key != ExactMatchCache.key(MESSAGES, model="gpt-4o", temperature=0)
+    assert key != ExactMatchCache.key(MESSAGES, model="gpt-4o-mini", temperature=0.5)
+    assert key != ExactMatchCache.key(MESSAGES[:1] + [HumanMessage(content="Other")], model="gpt-4o-mini", temperature=0)
+    assert key != ExactMatchCache.key([HumanMessage(content="Summarize."), MESSAGES[1]], model="gpt-4o-mini", temperature=0)
+
+
+def test_evicts_least_recently_used():
+    cache = ExactMatchCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
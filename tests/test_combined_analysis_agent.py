@@ -0,0 +1,50 @@
+"""Tests for the single-call combined analysis agent."""
+
+from fakes import COMBINED_JSON, SUMMARY_JSON, TRANSCRIPT, scripted
+
+from agents.combined_analysis_agent import CombinedAnalysisAgent
+from agents.quality_score_agent import INSUFFICIENT_CONTENT_SCORE
+from agents.summarization_agent import INSUFFICIENT_CONTENT_SUMMARY
+from utils.validation import AgentState, CallInput, InputType
+
+
+def make_state(text: str = TRANSCRIPT) -> AgentState:
+    return AgentState(
+        call_id="c1",
+        input_data=CallInput(input_type=InputType.TRANSCRIPT, content=text),
+        transcript_text=text
+    )
+
+
+def test_process_fills_summary_and_scores():
+    llm = scripted(COMBINED_JSON)
+    state = CombinedAnalysisAgent(llm=llm).process(make_state())
+
+    assert state.summary.outcome == "resolved"
+    assert state.quality_score.resolution_score == 9.0
+    assert len(llm.calls) == 1
+
+
+async def test_aprocess_fills_summary_and_scores():
+    state = await CombinedAnalysisAgent(llm=scripted(COMBINED_JSON)).aprocess(make_state())
+
+    assert state.summary.sentiment == "positive"
+    assert state.quality_score.tone_score == 8.0
+    assert not state.errors
+
+
+def test_short_transcript_skips_the_llm():
+    llm = scripted(COMBINED_JSON)
+    state = CombinedAnalysisAgent(llm=llm).process(make_state("Hello?"))
+
+    assert (state.summary, state.quality_score) == (INSUFFICIENT_CONTENT_SUMMARY, INSUFFICIENT_CONTENT_SCORE)
+    assert not llm.calls
+
+
+def test_invalid_output_is_retried_then_reported():
+    llm = scripted(SUMMARY_JSON)  # No score fields
+    state = CombinedAnalysisAgent(llm=llm).process(make_state())
+
+    assert state.summary is None and state.quality_score is None
+    assert state.errors[-1]["agent"] == "combined_analysis"
+    assert len(llm.calls) > 1
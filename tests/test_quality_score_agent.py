@@ -0,0 +1,136 @@
+"""Tests for the quality scoring agent's sync and async paths, cascade and score cache."""
+
+import asyncio
+
+from fakes import SCORE_JSON, TRANSCRIPT, scripted
+
+from agents.quality_score_agent import INSUFFICIENT_CONTENT_SCORE, QualityScoringAgent
+from utils.validation import AgentState, CallInput, InputType
+
+UNIFORM_SCORE_JSON = (
+    '{"tone_score": 7.0, "professionalism_score": 7.0, "resolution_score": 7.0, '
+    '"feedback": "Unsure."}'
+)
+
+
+def make_state(text: str = TRANSCRIPT) -> AgentState:
+    return AgentState(
+        call_id="c1",
+        input_data=CallInput(input_type=InputType.TRANSCRIPT, content=text),
+        transcript_text=text
+    )
+
+
+def cascade_agent(*models, **kwargs) -> QualityScoringAgent:
+    """An agent whose cascade is the given scripted models, weakest first."""
+    agent = QualityScoringAgent(llm=models[0], **kwargs)
+    agent._llm_cascade = [(llm.model_name, llm) for llm in models]
+    return agent
+
+
+def test_process_scores_transcript():
+    llm = scripted(SCORE_JSON)
+    state = QualityScoringAgent(llm=llm).process(make_state())
+
+    assert state.quality_score.resolution_score == 9.0
+    assert not state.errors
+    assert TRANSCRIPT.strip() in llm.calls[0][-1].content
+
+
+async def test_aprocess_scores_transcript():
+    state = await QualityScoringAgent(llm=scripted(SCORE_JSON)).aprocess(make_state())
+
+    assert state.quality_score.tone_score == 8.0
+    assert not state.errors
+
+
+def test_short_transcript_skips_the_llm():
+    llm = scripted(SCORE_JSON)
+    state = QualityScoringAgent(llm=llm).process(make_state("Hello?"))
+
+    assert state.quality_score == INSUFFICIENT_CONTENT_SCORE
+    assert not llm.calls
+
+
+def test_missing_transcript_is_an_error():
+    state = make_state()
+    state.transcript_text = None
+
+    assert QualityScoringAgent(llm=scripted(SCORE_JSON)).process(state).errors
+
+
+def test_invalid_output_escalates_to_next_model():
+    mini = scripted('{"tone_score": 0}', model_name="gpt-4o-mini")
+    strong = scripted(SCORE_JSON, model_name="gpt-4o")
+    state = cascade_agent(mini, strong).process(make_state())
+
+    assert state.quality_score.tone_score == 8.0
+    assert len(mini.calls) == len(strong.calls) == 1
+
+
+async def test_async_low_confidence_escalates_to_next_model():
+    mini = scripted(UNIFORM_SCORE_JSON, model_name="gpt-4o-mini")
+    strong = scripted(SCORE_JSON, model_name="gpt-4o")
+    state = await cascade_agent(mini, strong).aprocess(make_state())
+
+    assert state.quality_score.tone_score == 8.0
+
+
+def test_uniform_scores_kept_when_every_model_is_unsure():
+    mini = scripted(UNIFORM_SCORE_JSON, model_name="gpt-4o-mini")
+    strong = scripted("not json", model_name="gpt-4o")
+    state = cascade_agent(mini, strong).process(make_state())
+
+    assert state.quality_score.feedback == "Unsure."
+    assert not state.errors
+
+
+def test_invalid_output_from_every_model_is_an_error():
+    state = QualityScoringAgent(llm=scripted("not json")).process(make_state())
+
+    assert state.quality_score is None
+    assert "no model returned a valid score" in state.errors[-1]["error"]
+
+
+def test_stream_early_abort_stops_at_the_closing_brace():
+    llm = scripted(SCORE_JSON + " and some trailing prose the model kept writing")
+    state = QualityScoringAgent(llm=llm, stream_early_abort=True).process(make_state())
+
+    assert state.quality_score.feedback == "Clear and patient."
+
+
+def test_repeat_transcript_is_served_from_cache():
+    llm = scripted(SCORE_JSON)
+    agent = QualityScoringAgent(llm=llm)
+    agent.process(make_state())
+    agent.process(make_state())
+
+    assert len(llm.calls) == 1
+
+
+def test_score_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr("agents.quality_score_agent.SCORE_CACHE_MAX_ENTRIES", 1)
+    llm = scripted(SCORE_JSON)
+    agent = QualityScoringAgent(llm=llm)
+    for text in (TRANSCRIPT, TRANSCRIPT + " Second call.", TRANSCRIPT):
+        agent.process(make_state(text))
+
+    assert len(llm.calls) == 3
+
+
+def test_score_cache_is_keyed_on_the_model():
+    first = QualityScoringAgent(llm=scripted(SCORE_JSON, model_name="gpt-4o-mini"))
+    second = QualityScoringAgent(llm=scripted(SCORE_JSON, model_name="gpt-4o"))
+
+    assert first._cache_key(TRANSCRIPT) != second._cache_key(TRANSCRIPT)
+    assert first._cache_key(TRANSCRIPT) != first._cache_key(TRANSCRIPT + " ")
+
+
+async def test_concurrent_requests_for_one_transcript_share_a_call():
+    llm = scripted(SCORE_JSON)
+    agent = QualityScoringAgent(llm=llm)
+    states = await asyncio.gather(*(agent.aprocess(make_state()) for _ in range(4)))
+
+    assert all(state.quality_score.tone_score == 8.0 for state in states)
+    assert len(llm.calls) == 1
+    assert not agent._inflight
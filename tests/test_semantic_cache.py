@@ -0,0 +1,102 @@
+"""Tests for the two-tier semantic result cache."""
+
+import pytest
+from fakes import FakeEncoder
+
+from utils.semantic_cache import SemanticCache
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+
+GREETING = (
+    "thank you for calling acme support this call may be recorded for quality and training "
+    "purposes my name is sam how can i help you today "
+) * 8
+REFUND_CALL = GREETING + " ".join(
+    f"customer wants a refund for order {n} that arrived damaged and agent issues it" for n in range(20)
+)
+OUTAGE_CALL = GREETING + " ".join(
+    f"caller reports internet outage number {n} at home and technician visit is booked" for n in range(20)
+)
+
+
+def make_cache(**kwargs) -> SemanticCache:
+    kwargs.setdefault("namespace", "gpt-4o-mini|0")
+    return SemanticCache(encoder=FakeEncoder(), **kwargs)
+
+
+def test_exact_tier_ignores_case_and_whitespace():
+    cache = make_cache(threshold=1.1)  # Unreachable, so only the exact tier can hit
+    cache.put(REFUND_CALL, "refund")
+
+    assert cache.get("  " + REFUND_CALL.upper().replace(" ", "\n  ")) == "refund"
+    assert cache.get(REFUND_CALL + " extra") is None
+
+
+def test_exact_tier_evicts_least_recently_used():
+    cache = make_cache(threshold=1.1, max_entries=2)
+    cache.put("first call", 1)
+    cache.put("second call", 2)
+    cache.get("first call")
+    cache.put("third call", 3)
+
+    assert cache.get("first call") == 1
+    assert cache.get("second call") is None
+    assert cache.get("third call") == 3
+
+
+def test_near_duplicate_hits_only_above_threshold():
+    near_duplicate = REFUND_CALL.replace("damaged", "broken", 1)
+
+    lenient = make_cache(threshold=0.9)
+    lenient.put(REFUND_CALL, "refund")
+    assert lenient.get(near_duplicate) == "refund"
+
+    strict = make_cache(threshold=0.99999)
+    strict.put(REFUND_CALL, "refund")
+    assert strict.get(near_duplicate) is None
+
+
+def test_shared_greeting_is_not_a_hit():
+    # With no similarity threshold at all, different calls with the same script still don't match
+    cache = make_cache(threshold=0.0)
+    cache.put(REFUND_CALL, "refund")
+
+    assert cache.get(OUTAGE_CALL) is None
+
+
+def test_much_shorter_transcript_is_not_a_hit():
+    cache = make_cache(threshold=0.0)
+    cache.put(REFUND_CALL, "refund")
+
+    assert cache.get(REFUND_CALL[: len(REFUND_CALL) // 2]) is None
+
+
+def test_reload_keeps_both_tiers(tmp_path):
+    path = str(tmp_path / "cache")
+    cache = make_cache(persist_path=path)
+    cache.put(REFUND_CALL, "refund")
+    cache.save()
+
+    reloaded = make_cache(persist_path=path)
+    assert reloaded.get(REFUND_CALL) == "refund"
+    assert reloaded.get(REFUND_CALL.replace("damaged", "broken", 1)) == "refund"
+
+
+@pytest.mark.parametrize("changed", [{"namespace": "gpt-4o|0"}, {"embedding_model": "other-encoder"}])
+def test_reload_ignores_other_namespace(tmp_path, changed):
+    path = str(tmp_path / "cache")
+    cache = make_cache(persist_path=path)
+    cache.put(REFUND_CALL, "refund")
+    cache.save()
+
+    reloaded = make_cache(persist_path=path, **changed)
+    assert reloaded.get(REFUND_CALL) is None
+
+
+def test_reload_ignores_truncated_sidecar(tmp_path):
+    path = str(tmp_path / "cache")
+    (tmp_path / "cache.pkl").write_bytes(b"")
+
+    cache = make_cache(persist_path=path)
+    assert cache.get(REFUND_CALL) is None
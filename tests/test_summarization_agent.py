@@ -0,0 +1,172 @@
+"""Tests for the summarization agent's streaming, caching and model cascade."""
+
+import json
+
+from fakes import SUMMARY_JSON, TRANSCRIPT, ScriptedChatModel, scripted
+
+from agents.summarization_agent import INSUFFICIENT_CONTENT_SUMMARY, SummarizationAgent
+from utils.validation import AgentState, CallInput, InputType
+
+EMPTY_SUMMARY_JSON = '{"sentiment": "neutral", "outcome": "unresolved", "summary": " ", "key_points": []}'
+
+
+def make_state(text: str = TRANSCRIPT) -> AgentState:
+    return AgentState(
+        call_id="c1",
+        input_data=CallInput(input_type=InputType.TRANSCRIPT, content=text),
+        transcript_text=text
+    )
+
+
+def cascade_agent(*models) -> SummarizationAgent:
+    """An agent whose cascade is the given scripted models, weakest first."""
+    agent = SummarizationAgent(llm=models[0])
+    agent._llm_cascade = [(llm.model_name, llm) for llm in models]
+    return agent
+
+
+async def collect(agent: SummarizationAgent, state: AgentState) -> list:
+    return [fields async for fields in agent.astream_summary(state)]
+
+
+async def test_stream_yields_routing_fields_first():
+    agent = SummarizationAgent(llm=scripted(SUMMARY_JSON))
+    state = make_state()
+    updates = await collect(agent, state)
+
+    assert list(updates[0]) == ["sentiment"]
+    assert updates[-1] == state.summary.model_dump()
+    assert state.summary.outcome == "resolved"
+
+
+async def test_stream_escalates_empty_summary():
+    mini = scripted(EMPTY_SUMMARY_JSON, model_name="gpt-4o-mini")
+    strong = scripted(SUMMARY_JSON, model_name="gpt-4o")
+    state = make_state()
+    await collect(cascade_agent(mini, strong), state)
+
+    assert state.summary.summary == "Customer reset their password."
+    assert len(mini.calls) == len(strong.calls) == 1
+
+
+async def test_stream_records_error_when_every_model_fails():
+    state = make_state()
+    await collect(SummarizationAgent(llm=scripted("not json")), state)
+
+    assert state.summary is None
+    assert "no model returned a valid summary" in state.errors[-1]["error"]
+
+
+async def test_stream_and_aprocess_share_the_cache():
+    llm = scripted(SUMMARY_JSON)
+    agent = SummarizationAgent(llm=llm)
+    streamed = make_state()
+    await collect(agent, streamed)
+
+    processed = await agent.aprocess(make_state())
+    cached_stream = make_state()
+    updates = await collect(agent, cached_stream)
+
+    assert processed.summary == streamed.summary == cached_stream.summary
+    assert updates == [streamed.summary.model_dump()]
+    assert len(llm.calls) == 1
+
+
+def test_process_summarizes_transcript():
+    llm = scripted(SUMMARY_JSON)
+    state = SummarizationAgent(llm=llm).process(make_state())
+
+    assert state.summary.outcome == "resolved"
+    assert not state.errors
+    assert TRANSCRIPT.strip() in llm.calls[0][-1].content
+
+
+async def test_aprocess_summarizes_transcript():
+    state = await SummarizationAgent(llm=scripted(SUMMARY_JSON)).aprocess(make_state())
+
+    assert state.summary.sentiment == "positive"
+    assert not state.errors
+
+
+def test_short_transcript_skips_the_llm():
+    llm = scripted(SUMMARY_JSON)
+    state = SummarizationAgent(llm=llm).process(make_state("Hello?"))
+
+    assert state.summary == INSUFFICIENT_CONTENT_SUMMARY
+    assert not llm.calls
+
+
+def test_invalid_output_escalates_to_next_model():
+    mini = scripted('{"summary": 1}', model_name="gpt-4o-mini")
+    strong = scripted(SUMMARY_JSON, model_name="gpt-4o")
+    state = cascade_agent(mini, strong).process(make_state())
+
+    assert state.summary.outcome == "resolved"
+    assert len(mini.calls) == len(strong.calls) == 1
+
+
+async def test_async_empty_summary_escalates_to_next_model():
+    mini = scripted(EMPTY_SUMMARY_JSON, model_name="gpt-4o-mini")
+    strong = scripted(SUMMARY_JSON, model_name="gpt-4o")
+    state = await cascade_agent(mini, strong).aprocess(make_state())
+
+    assert state.summary.summary == "Customer reset their password."
+
+
+def test_empty_summary_kept_when_no_model_does_better():
+    mini = scripted(EMPTY_SUMMARY_JSON, model_name="gpt-4o-mini")
+    strong = scripted("not json", model_name="gpt-4o")
+    state = cascade_agent(mini, strong).process(make_state())
+
+    assert state.summary.outcome == "unresolved"
+    assert not state.errors
+
+
+def test_invalid_output_from_every_model_is_an_error():
+    state = SummarizationAgent(llm=scripted("not json")).process(make_state())
+
+    assert state.summary is None
+    assert "no model returned a valid summary" in state.errors[-1]["error"]
+
+
+def test_repeat_transcript_is_served_from_cache():
+    llm = scripted(SUMMARY_JSON)
+    agent = SummarizationAgent(llm=llm)
+    agent.process(make_state())
+    agent.process(make_state())
+
+    assert len(llm.calls) == 1
+
+
+def test_on_partial_reports_fields_as_they_complete():
+    updates = []
+    agent = SummarizationAgent(llm=scripted(SUMMARY_JSON), on_partial=lambda fields: updates.append(list(fields)))
+    agent.process(make_state())
+
+    assert updates[0] == ["sentiment"]
+    assert updates[-1] == ["sentiment", "outcome", "summary", "key_points"]
+
+
+def test_process_batch_sends_one_request_per_group(monkeypatch):
+    monkeypatch.setattr("agents.summarization_agent.DEFAULT_MAX_BATCH_SIZE", 2)
+
+    def respond(messages):
+        count = messages[-1].content.count("<<TRANSCRIPT ")
+        return json.dumps({"summaries": [json.loads(SUMMARY_JSON)] * count})
+
+    llm = ScriptedChatModel(respond=respond)
+    states = [make_state(f"{TRANSCRIPT} Call {n}.") for n in range(3)] + [make_state("Hi.")]
+    states = SummarizationAgent(llm=llm).process_batch(states)
+
+    assert [len(call[-1].content.split("<<TRANSCRIPT ")) - 1 for call in llm.calls] == [2, 1]
+    assert all(state.summary.outcome == "resolved" for state in states[:3])
+    assert states[3].summary == INSUFFICIENT_CONTENT_SUMMARY
+
+
+async def test_aprocess_batch_fails_a_group_with_missing_summaries():
+    llm = scripted(json.dumps({"summaries": [json.loads(SUMMARY_JSON)]}))
+    states = [make_state(f"{TRANSCRIPT} Call {n}.") for n in range(2)]
+    states = await SummarizationAgent(llm=llm).aprocess_batch(states)
+
+    assert all(state.summary is None and state.errors for state in states)
+
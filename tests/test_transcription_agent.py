@@ -0,0 +1,56 @@
+"""Tests for the transcription agent's cache keying."""
+
+import pytest
+
+from agents.transcription_agent import TranscriptionAgent
+from config.settings import get_config
+
+AUDIO = b"ID3 fake audio bytes"
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRANSCRIPTION_CACHE_DIR", str(tmp_path))
+    return TranscriptionAgent(openai_api_key="sk-test")
+
+
+def cache_key_with(monkeypatch, **env) -> str:
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    get_config.cache_clear()
+    return TranscriptionAgent._cache_key(AUDIO)
+
+
+def test_cache_key_is_stable_for_the_same_audio(tmp_path):
+    path = tmp_path / "call.mp3"
+    path.write_bytes(AUDIO)
+
+    assert TranscriptionAgent._cache_key(AUDIO) == TranscriptionAgent._cache_key(path)
+    assert TranscriptionAgent._cache_key(AUDIO) != TranscriptionAgent._cache_key(AUDIO + b"!")
+
+
+def test_cache_key_tracks_preprocessing(monkeypatch):
+    plain = cache_key_with(monkeypatch, PREPROCESS_AUDIO="false", AUDIO_SPEEDUP="1.5")
+    preprocessed = cache_key_with(monkeypatch, PREPROCESS_AUDIO="true", AUDIO_SPEEDUP="1.0")
+    sped_up = cache_key_with(monkeypatch, PREPROCESS_AUDIO="true", AUDIO_SPEEDUP="1.5")
+
+    assert len({plain, preprocessed, sped_up}) == 3
+
+
+def test_cached_transcript_skips_whisper(agent, monkeypatch):
+    calls = []
+    monkeypatch.setattr(agent, "_request_transcript", lambda audio, name=None: calls.append(audio) or "hello")
+
+    assert agent._transcribe_audio(AUDIO, "call.mp3") == "hello"
+    assert agent._transcribe_audio(AUDIO, "call.mp3") == "hello"
+    assert len(calls) == 1
+    assert list(agent.cache_dir.glob("*.json"))
+
+
+def test_cache_key_tracks_silence_trimming(monkeypatch):
+    untrimmed = cache_key_with(monkeypatch, TRIM_SILENCE="false")
+    trimmed = cache_key_with(monkeypatch, TRIM_SILENCE="true")
+    monkeypatch.setattr("agents.transcription_agent.VAD_AGGRESSIVENESS", 3)
+    more_aggressive = TranscriptionAgent._cache_key(AUDIO)
+
+    assert len({untrimmed, trimmed, more_aggressive}) == 3
@@ -0,0 +1,93 @@
+"""Tests for the workflow graph: node order, retry routing and the result cache."""
+
+import pytest
+from fakes import TRANSCRIPT, FakeEncoder, by_prompt
+
+from agents.prompts import SUMMARY_PROMPT
+from utils.semantic_cache import SemanticCache
+from utils.validation import AgentState, CallInput, InputType
+from workflow import CallCenterWorkflow
+
+
+def make_input(text: str = TRANSCRIPT) -> CallInput:
+    return CallInput(input_type=InputType.TRANSCRIPT, content=text)
+
+
+def summary_calls(llm) -> int:
+    return sum(1 for messages in llm.calls if messages[0].content == SUMMARY_PROMPT)
+
+
+def test_process_call_reports_each_node():
+    nodes = []
+    workflow = CallCenterWorkflow(llm=by_prompt(), semantic_cache=False)
+    result = workflow.process_call(make_input(), on_node_complete=nodes.append)
+
+    assert result.status == "success"
+    assert result.summary.outcome == "resolved"
+    assert result.quality_score.tone_score == 8.0
+    assert nodes == ["transcription", "analysis"]
+
+
+async def test_aprocess_call_succeeds():
+    workflow = CallCenterWorkflow(llm=by_prompt(), semantic_cache=False)
+    result = await workflow.aprocess_call(make_input())
+
+    assert result.status == "success"
+    assert result.transcript_text == TRANSCRIPT
+
+
+def test_retry_reruns_only_the_failed_agent():
+    llm = by_prompt(quality="not json")
+    nodes = []
+    result = CallCenterWorkflow(llm=llm, semantic_cache=False).process_call(
+        make_input(), on_node_complete=nodes.append
+    )
+
+    assert result.status == "partial"
+    assert result.summary is not None and result.quality_score is None
+    assert [e["agent"] for e in result.errors] == ["quality_scoring"] * 3
+    assert nodes == ["transcription"] + ["analysis"] * 3
+    assert summary_calls(llm) == 1
+
+
+async def test_combined_mode_makes_one_call():
+    llm = by_prompt()
+    workflow = CallCenterWorkflow(llm=llm, combined_analysis=True, semantic_cache=False)
+    result = await workflow.aprocess_call(make_input())
+
+    assert result.status == "success"
+    assert len(llm.calls) == 1
+
+
+def test_should_retry_only_on_new_errors_within_the_limit():
+    workflow = CallCenterWorkflow(llm=by_prompt(), semantic_cache=False)
+    state = AgentState(call_id="c1", input_data=make_input())
+
+    assert not workflow._should_retry(state, "summarization")
+    state.add_error("summarization", "boom")
+    assert workflow._should_retry(state, "summarization")
+
+    workflow._record_attempt(state, "summarization")
+    assert not workflow._should_retry(state, "summarization")
+
+    state.add_error("summarization", "boom")
+    state.add_error("summarization", "boom")
+    workflow._record_attempt(state, "summarization")
+    state.add_error("summarization", "boom")
+    assert not workflow._should_retry(state, "summarization")
+
+
+def test_result_cache_serves_repeat_transcripts():
+    pytest.importorskip("numpy")
+    pytest.importorskip("faiss")
+    llm = by_prompt()
+    workflow = CallCenterWorkflow(llm=llm, semantic_cache=False)
+    workflow.result_cache = SemanticCache(namespace=workflow._result_cache_namespace(), encoder=FakeEncoder())
+
+    first = workflow.process_call(make_input())
+    calls = len(llm.calls)
+    second = workflow.process_call(make_input())
+
+    assert second.status == "success"
+    assert second.summary == first.summary
+    assert len(llm.calls) == calls
@@ -2,22 +2,48 @@
 Modern Streamlit UI for AI Call Center Assistant.
 """
 
+import functools
+import hashlib
 import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
 import streamlit as st
-from dotenv import load_dotenv
-import plotly.graph_objects as go
 
-from utils.validation import CallInput, InputType
+from utils.constants import AUDIO_EXTENSIONS, STATUS_FAILED, STATUS_PARTIAL, STATUS_SUCCESS
+from utils.validation import CallInput, InputType, ProcessingResult
 from workflow import CallCenterWorkflow
 
-# Load environment variables
-load_dotenv()
-
 # Configure logging for UI
 from config.settings import setup_logging
 setup_logging()
 
+# Longer transcripts are paged through in fixed windows
+TRANSCRIPT_PAGINATE_CHARS = 50_000
+TRANSCRIPT_WINDOW_CHARS = 10_000
+# Successful results kept for repeat uploads
+RESULT_CACHE_MAX_ENTRIES = 32
+
+# Lookups used on every rerun, built once at import
+_STATUS_ICONS = {
+    STATUS_SUCCESS: '<i class="fas fa-check-circle" style="color: green;"></i>',
+    STATUS_PARTIAL: '<i class="fas fa-exclamation-triangle" style="color: orange;"></i>',
+    STATUS_FAILED: '<i class="fas fa-times-circle" style="color: red;"></i>'
+}
+# Graph node -> (label, progress % once it finishes)
+_NODE_STAGES = {
+    "transcription": ("Transcription", 40),
+    "analysis": ("Summary and quality scoring", 100)
+}
+_SENTIMENT_EMOJIS = {
+    "positive": "😊",
+    "neutral": "😐",
+    "negative": "😔"
+}
+
 # Page configuration
 st.set_page_config(
     page_title="AI Call Center Assistant",
@@ -27,9 +53,9 @@ st.set_page_config(
 )
 
 
-def inject_custom_css():
-    """Inject custom CSS for professional styling."""
-    st.markdown("""
+# Page styling, minified once at import: comments and runs of whitespace
+# would otherwise be re-sent to the browser on every rerun
+CUSTOM_CSS = """
     <style>
     /* Main container styling */
     .main .block-container {
@@ -207,7 +233,15 @@ def inject_custom_css():
         color: white;
     }
     </style>
-    """, unsafe_allow_html=True)
+"""
+_MINIFIED_CSS = re.sub(r"/\*.*?\*/", "", CUSTOM_CSS, flags=re.S)
+_MINIFIED_CSS = re.sub(r"\s*([{}:;,>])\s*", r"\1", re.sub(r"\s+", " ", _MINIFIED_CSS)).strip()
+
+
+def inject_custom_css():
+    """Inject custom CSS for professional styling."""
+    # Streamlit drops elements a rerun doesn't emit, so this must run every time
+    st.markdown(_MINIFIED_CSS, unsafe_allow_html=True)
 
 def render_header():
     """Render the professional header section."""
@@ -218,12 +252,36 @@ def render_header():
     </div>
     """, unsafe_allow_html=True)
 
-def render_quality_gauge(score, title, color="#3b82f6", dark_mode=None):
-    """Render a quality score gauge using Plotly with adaptive colors."""
+def build_quality_dashboard(scores: Dict[str, Tuple[float, str]], dark_mode=None) -> dict:
+    """
+    Build one Plotly figure holding a gauge per quality score, with adaptive colors.
+    
+    Args:
+        scores: Gauge title -> (score, bar color), laid out left to right
+        dark_mode: Theme override; defaults to the session's setting
+    
+    Returns:
+        Figure as a plain dict, which st.plotly_chart accepts directly
+    """
     # Auto-detect based on session state if not provided
     if dark_mode is None:
         dark_mode = st.session_state.get('dark_mode', False)  # Default to light mode
     
+    gauges = tuple((title, color) for title, (_, color) in scores.items())
+    template = _quality_dashboard_template(gauges, dark_mode)
+    # Copy just the traces to fill in the scores; the cached template is shared across sessions
+    return {
+        **template,
+        'data': [{**trace, 'value': score} for trace, (score, _) in zip(template['data'], scores.values())]
+    }
+
+@functools.lru_cache(maxsize=8)
+def _quality_dashboard_template(gauges: Tuple[Tuple[str, str], ...], dark_mode: bool) -> dict:
+    """Build the gauge figure for (title, bar color) pairs once; only the values change per render."""
+    # Plotly is heavy to import and only needed once there are scores to show
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
     # Use adaptive colors based on theme
     if dark_mode:
         # Dark mode: light text on dark background
@@ -246,29 +304,31 @@ def render_quality_gauge(score, title, color="#3b82f6", dark_mode=None):
             {'range': [7, 10], 'color': "rgba(220, 252, 231, 0.8)"}  # Light green
         ]
     
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number",
-        value = score,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': title, 'font': {'size': 16, 'color': text_color}},
-        number = {'font': {'size': 32, 'color': text_color}, 'suffix': "/10"},
-        gauge = {
-            'axis': {
-                'range': [0, 10], 
-                'tickwidth': 2, 
-                'tickcolor': tick_color, 
-                'tickfont': {'size': 12, 'color': tick_color},
-                'tickmode': 'linear',
-                'tick0': 0,
-                'dtick': 2
-            },
-            'bar': {'color': color, 'thickness': 0.4},
-            'bgcolor': bg_color,
-            'borderwidth': 2,
-            'bordercolor': tick_color,
-            'steps': steps_colors
-        }
-    ))
+    # One figure means one payload and one chart mount instead of three
+    fig = make_subplots(rows=1, cols=len(gauges), specs=[[{'type': 'indicator'}] * len(gauges)])
+    for column, (title, color) in enumerate(gauges, start=1):
+        fig.add_trace(go.Indicator(
+            mode = "gauge+number",
+            value = 0,
+            title = {'text': title, 'font': {'size': 16, 'color': text_color}},
+            number = {'font': {'size': 32, 'color': text_color}, 'suffix': "/10"},
+            gauge = {
+                'axis': {
+                    'range': [0, 10], 
+                    'tickwidth': 2, 
+                    'tickcolor': tick_color, 
+                    'tickfont': {'size': 12, 'color': tick_color},
+                    'tickmode': 'linear',
+                    'tick0': 0,
+                    'dtick': 2
+                },
+                'bar': {'color': color, 'thickness': 0.4},
+                'bgcolor': bg_color,
+                'borderwidth': 2,
+                'bordercolor': tick_color,
+                'steps': steps_colors
+            }
+        ), row=1, col=column)
     
     fig.update_layout(
         height=200,
@@ -278,7 +338,50 @@ def render_quality_gauge(score, title, color="#3b82f6", dark_mode=None):
         plot_bgcolor='rgba(0,0,0,0)'
     )
     
-    return fig
+    return fig.to_dict()
+
+@st.cache_resource(show_spinner=False)
+def get_workflow(openai_api_key: str) -> CallCenterWorkflow:
+    """Build the workflow once per API key and reuse it across reruns."""
+    return CallCenterWorkflow(openai_api_key=openai_api_key)
+
+@st.cache_resource(show_spinner=False)
+def _result_cache() -> Tuple[OrderedDict, threading.Lock]:
+    """Successful results by upload, shared across sessions and reruns."""
+    return OrderedDict(), threading.Lock()
+
+def _process_upload(
+    file_hash: str,
+    input_type: InputType,
+    file_name: str,
+    content,
+    openai_api_key: str,
+    on_node_complete: Optional[Callable[[str], None]] = None
+) -> ProcessingResult:
+    """
+    Run the workflow once per distinct upload.
+    
+    Results are memoized here rather than with st.cache_data, which would
+    record the progress callbacks' writes to UI elements created outside it
+    and fail to replay them on a cache hit. Only successful results are
+    kept, so a partial or failed run is retried fresh.
+    """
+    key = (file_hash, input_type.value, file_name)
+    cache, lock = _result_cache()
+    with lock:
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return result
+    
+    call_input = CallInput(input_type=input_type, content=content, file_name=file_name)
+    result = get_workflow(openai_api_key).process_call(call_input, on_node_complete=on_node_complete)
+    if result.status == STATUS_SUCCESS:
+        with lock:
+            cache[key] = result
+            if len(cache) > RESULT_CACHE_MAX_ENTRIES:
+                cache.popitem(last=False)
+    return result
 
 def main():
     """Main Streamlit application."""
@@ -339,21 +442,39 @@ def main():
         
         st.markdown("---")
         
-        openai_key = st.text_input(
-            "OpenAI API Key",
-            type="password",
-            value=os.getenv('OPENAI_API_KEY', ''),
-            help="Required for transcription (Whisper), summarization, and quality scoring"
-        )
+        # Keys start from the environment and change only when the form is saved,
+        # so typing doesn't rerun the script on every keystroke
+        if 'openai_key' not in st.session_state:
+            st.session_state.openai_key = os.getenv('OPENAI_API_KEY', '')
+            st.session_state.langsmith_key = os.getenv('LANGCHAIN_API_KEY', '')
+            apply_keys = True
+        else:
+            apply_keys = False
         
-        langsmith_key = st.text_input(
-            "LangSmith API Key (optional)",
-            type="password", 
-            value=os.getenv('LANGCHAIN_API_KEY', ''),
-            help="For debugging traces in LangSmith - visit https://smith.langchain.com/"
-        )
+        with st.form("config"):
+            openai_input = st.text_input(
+                "OpenAI API Key",
+                type="password",
+                value=st.session_state.openai_key,
+                help="Required for transcription (Whisper), summarization, and quality scoring"
+            )
+            
+            langsmith_input = st.text_input(
+                "LangSmith API Key (optional)",
+                type="password", 
+                value=st.session_state.langsmith_key,
+                help="For debugging traces in LangSmith - visit https://smith.langchain.com/"
+            )
+            
+            if st.form_submit_button("Save", use_container_width=True):
+                st.session_state.openai_key = openai_input
+                st.session_state.langsmith_key = langsmith_input
+                apply_keys = True
         
-        if langsmith_key:
+        openai_key = st.session_state.openai_key
+        langsmith_key = st.session_state.langsmith_key
+        
+        if apply_keys and langsmith_key:
             os.environ["LANGCHAIN_API_KEY"] = langsmith_key
             os.environ["LANGCHAIN_TRACING_V2"] = "true"
         
@@ -379,8 +500,12 @@ def main():
         
         # Reset UI state when a different file is uploaded
         if uploaded_file:
+            # Read the upload once; everything below reuses these bytes
+            raw_bytes = uploaded_file.getvalue()
+            file_hash = hashlib.blake2b(raw_bytes, digest_size=16).hexdigest()
+            
             # Check if this is a new file (different from the last processed one)
-            current_file_id = f"{uploaded_file.name}_{len(uploaded_file.getvalue())}"
+            current_file_id = file_hash
             if 'last_processed_file_id' not in st.session_state:
                 st.session_state.last_processed_file_id = None
             
@@ -397,7 +522,7 @@ def main():
                 st.session_state.last_processed_file_id = current_file_id
         
         if uploaded_file:
-            file_size = len(uploaded_file.getvalue()) / 1024 / 1024  # MB
+            file_size = len(raw_bytes) / 1024 / 1024  # MB
             st.markdown(f'<div style="padding: 0.75rem; background-color: #dcfce7; border: 1px solid #16a34a; border-radius: 0.5rem; color: #166534;"><i class="fas fa-check-circle"></i> **{uploaded_file.name}** ({file_size:.1f} MB)</div>', unsafe_allow_html=True)
             
             process_button = st.button(
@@ -407,174 +532,66 @@ def main():
                 help="Start processing the uploaded file"
             )
             
-            if process_button:
+            # Identifies a run by file and key; the key is stored only as a digest
+            processed_key = (file_hash, hashlib.sha256(openai_key.encode()).hexdigest())
+            already_processed = (
+                st.session_state.get('processed_key') == processed_key
+                and st.session_state.get('result') is not None
+            )
+            
+            if process_button and already_processed:
+                # Unrelated reruns and repeat clicks keep the result already on screen
+                st.info("This file has already been processed; showing the existing results.")
+            elif process_button:
                 # Process the file
                 try:
-                    # Create workflow
-                    workflow = CallCenterWorkflow(
-                        openai_api_key=openai_key
-                    )
-                    
                     # Determine input type and content
-                    file_extension = uploaded_file.name.lower().split('.')[-1] if '.' in uploaded_file.name else ''
-                    audio_extensions = ['mp3', 'wav', 'm4a', 'ogg', 'webm']
+                    file_extension = os.path.splitext(uploaded_file.name)[1].lower().lstrip('.')
                     
-                    
-                    if uploaded_file.type.startswith('audio/') or file_extension in audio_extensions:
+                    if uploaded_file.type.startswith('audio/') or file_extension in AUDIO_EXTENSIONS:
                         input_type = InputType.AUDIO
-                        content = uploaded_file.read()
+                        content = raw_bytes
                     else:
                         input_type = InputType.TRANSCRIPT
                         try:
-                            content = uploaded_file.read().decode('utf-8')
+                            content = raw_bytes.decode('utf-8')
                         except UnicodeDecodeError:
                             st.error("❌ Unable to read text file. Please ensure it's a valid text file.")
                             return
                     
-                    # Create input
-                    call_input = CallInput(
-                        input_type=input_type,
-                        content=content,
-                        file_name=uploaded_file.name
-                    )
-                    
-                    # Process through workflow with detailed progress
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    timing_text = st.empty()
-                    
-                    # Track timing for each step
-                    step_times = {}
-                    overall_start = time.time()
-                    
-                    # Step 1: Initialize
-                    init_start = time.time()
-                    status_text.markdown('<i class="fas fa-rocket"></i> Initializing workflow...', unsafe_allow_html=True)
-                    progress_bar.progress(10)
-                    time.sleep(0.5)
-                    step_times["initialize"] = time.time() - init_start
-                    timing_text.markdown(f"<small>Initialize: {step_times['initialize']:.1f}s</small>", unsafe_allow_html=True)
-                    
-                    # Step 2: Transcription
-                    transcription_start = time.time()
-                    if input_type == InputType.AUDIO:
-                        status_text.markdown('<i class="fas fa-microphone"></i> Transcribing audio...', unsafe_allow_html=True)
-                        progress_bar.progress(25)
-                    else:
-                        status_text.markdown('<i class="fas fa-file-text"></i> Processing transcript...', unsafe_allow_html=True)
-                        progress_bar.progress(25)
-                    
-                    # Start processing in background
-                    import threading
-                    result_container = {"result": None, "error": None}
-                    
-                    def process_workflow():
-                        try:
-                            result_container["result"] = workflow.process_call(call_input)
-                        except Exception as e:
-                            result_container["error"] = e
-                    
-                    # Start processing
-                    thread = threading.Thread(target=process_workflow)
-                    thread.start()
-                    
-                    # Transcription phase
-                    transcription_complete = False
-                    for i in range(8):
-                        if not thread.is_alive():
-                            transcription_complete = True
-                            break
-                        time.sleep(0.5)
-                        if result_container["error"]:
-                            break
-                    
-                    if not transcription_complete:
-                        step_times["transcription"] = time.time() - transcription_start
-                        timing_text.markdown(f"<small>Initialize: {step_times['initialize']:.1f}s | Transcription: {step_times['transcription']:.1f}s</small>", unsafe_allow_html=True)
-                    
-                    if thread.is_alive():
-                        summarization_start = time.time()
-                        status_text.markdown('<i class="fas fa-edit"></i> Summarizing call content...', unsafe_allow_html=True)
-                        progress_bar.progress(55)
+                    # Report real progress: the workflow calls back as each graph node finishes
+                    overall_start = step_start = time.time()
+                    first_label = "Transcribing audio..." if input_type == InputType.AUDIO else "Reading transcript..."
+                    with st.status(first_label, expanded=True) as status:
+                        progress_bar = st.progress(0)
                         
-                        # Summarization phase
-                        summarization_complete = False
-                        for i in range(8):
-                            if not thread.is_alive():
-                                summarization_complete = True
-                                break
-                            time.sleep(0.5)
-                            if result_container["error"]:
-                                break
+                        def on_node_complete(node):
+                            nonlocal step_start
+                            now = time.time()
+                            label, percent = _NODE_STAGES.get(node, (node, 0))
+                            status.write(f"{label} finished in {now - step_start:.1f}s")
+                            progress_bar.progress(percent)
+                            step_start = now
+                            if node == "transcription":
+                                status.update(label="Summarizing and scoring the call...")
                         
-                        if not summarization_complete:
-                            step_times["summarization"] = time.time() - summarization_start
-                            timing_display = f"Initialize: {step_times['initialize']:.1f}s"
-                            if "transcription" in step_times:
-                                timing_display += f" | Transcription: {step_times['transcription']:.1f}s"
-                            timing_display += f" | Summarization: {step_times['summarization']:.1f}s"
-                            timing_text.markdown(f"<small>{timing_display}</small>", unsafe_allow_html=True)
-                    
-                    if thread.is_alive():
-                        quality_start = time.time()
-                        status_text.markdown('<i class="fas fa-bullseye"></i> Assessing call quality...', unsafe_allow_html=True)
-                        progress_bar.progress(80)
-                        
-                        # Quality scoring phase
-                        for i in range(8):
-                            if not thread.is_alive():
-                                break
-                            time.sleep(0.5)
-                            if result_container["error"]:
-                                break
+                        # Identical uploads are served from the result cache, with no node updates
+                        result = _process_upload(
+                            file_hash, input_type, uploaded_file.name, content, openai_key,
+                            on_node_complete=on_node_complete
+                        )
                         
-                        step_times["quality_scoring"] = time.time() - quality_start
-                    
-                    # Wait for completion
-                    while thread.is_alive():
-                        time.sleep(0.1)
-                    
-                    # Check for retry scenarios
-                    if result_container["result"] and result_container["result"].errors:
-                        retry_start = time.time()
-                        status_text.markdown('<i class="fas fa-redo"></i> Retrying failed components...', unsafe_allow_html=True)
-                        progress_bar.progress(90)
-                        time.sleep(1)
-                        step_times["retry"] = time.time() - retry_start
-                    
-                    # Finalize
-                    status_text.markdown('<i class="fas fa-check-circle"></i> Processing complete!', unsafe_allow_html=True)
-                    progress_bar.progress(100)
-                    
-                    # Show final timing breakdown
-                    total_time = time.time() - overall_start
-                    timing_display = f"**Total: {total_time:.1f}s** | "
-                    timing_parts = []
-                    if "transcription" in step_times:
-                        timing_parts.append(f"Transcription: {step_times['transcription']:.1f}s")
-                    if "summarization" in step_times:
-                        timing_parts.append(f"Summarization: {step_times['summarization']:.1f}s")
-                    if "quality_scoring" in step_times:
-                        timing_parts.append(f"Quality: {step_times['quality_scoring']:.1f}s")
-                    if "retry" in step_times:
-                        timing_parts.append(f"Retry: {step_times['retry']:.1f}s")
-                    
-                    timing_display += " | ".join(timing_parts)
-                    timing_text.markdown(f"<small>{timing_display}</small>", unsafe_allow_html=True)
-                    
-                    time.sleep(1)
-                    
-                    # Clear progress indicators but keep timing
-                    progress_bar.empty()
-                    status_text.empty()
-                    
-                    if result_container["error"]:
-                        raise result_container["error"]
-                    
-                    result = result_container["result"]
+                        progress_bar.empty()
+                        status.update(
+                            label=f"Processing {result.status} in {time.time() - overall_start:.1f}s",
+                            state="complete" if result.status == STATUS_SUCCESS else "error",
+                            expanded=False
+                        )
                     
                     # Store result in session state
                     st.session_state.result = result
+                    # Partial or failed runs stay retryable
+                    st.session_state.processed_key = processed_key if result.status == STATUS_SUCCESS else None
                     st.markdown('<div style="padding: 0.75rem; background-color: #dcfce7; border: 1px solid #16a34a; border-radius: 0.5rem; color: #166534;"><i class="fas fa-check-circle"></i> Processing complete!</div>', unsafe_allow_html=True)
                     
                 except Exception as e:
@@ -588,23 +605,13 @@ def main():
             result = st.session_state.result
             
             # Status display at the top
-            status_icons = {
-                "success": '<i class="fas fa-check-circle" style="color: green;"></i>',
-                "partial": '<i class="fas fa-exclamation-triangle" style="color: orange;"></i>', 
-                "failed": '<i class="fas fa-times-circle" style="color: red;"></i>'
-            }
-            status_icon = status_icons.get(result.status, '<i class="fas fa-question-circle"></i>')
+            status_icon = _STATUS_ICONS.get(result.status, '<i class="fas fa-question-circle"></i>')
             st.markdown(f'<div style="padding: 0.75rem; background-color: #dbeafe; border: 1px solid #3b82f6; border-radius: 0.5rem; color: #1e40af;">{status_icon} Processing {result.status.upper()} ({result.processing_time_seconds:.1f}s)</div>', unsafe_allow_html=True)
             
             # Determine summary tab label based on sentiment
             summary_tab_label = "Summary"
             if result.summary and hasattr(result.summary, 'sentiment'):
-                sentiment_emojis = {
-                    "positive": "😊",
-                    "neutral": "😐",
-                    "negative": "😔"
-                }
-                emoji = sentiment_emojis.get(result.summary.sentiment.lower(), "")
+                emoji = _SENTIMENT_EMOJIS.get(result.summary.sentiment.lower(), "")
                 if emoji:
                     summary_tab_label = f"{emoji} Summary"
             
@@ -619,18 +626,27 @@ def main():
                 # Transcript tab content
                 if result.transcript_text:
                     st.markdown("### Call Transcript")
-                    st.markdown(f"""
-                    <div style="background-color: #f0f2f6; padding: 1rem; border-radius: 0.5rem; max-height: 400px; overflow-y: auto;">
-                        {result.transcript_text}
-                    </div>
-                    """, unsafe_allow_html=True)
+                    transcript = result.transcript_text
+                    # Very long calls are shown a window at a time
+                    if len(transcript) > TRANSCRIPT_PAGINATE_CHARS:
+                        page_count = -(-len(transcript) // TRANSCRIPT_WINDOW_CHARS)
+                        page = st.slider("Part", 1, page_count, 1)
+                        transcript = transcript[(page - 1) * TRANSCRIPT_WINDOW_CHARS:page * TRANSCRIPT_WINDOW_CHARS]
+                    # A fixed-height textarea scrolls its text instead of laying it all out in the page
+                    st.text_area(
+                        "Transcript",
+                        value=transcript,
+                        height=400,
+                        disabled=True,
+                        label_visibility="collapsed"
+                    )
                 else:
                     st.info("No transcript available for this call.")
             
             with tab2:
                 # Call Summary tab content
                 if result.summary:
-                    st.write(result.summary.summary)
+                    st.text(result.summary.summary)
                     
                     # Key Points - only show if they exist
                     if result.summary.key_points:
@@ -644,34 +660,13 @@ def main():
                 # Quality Assessment tab content
                 if result.quality_score:
                     # Quality gauge visualizations
-                    col_tone, col_professionalism, col_resolution = st.columns(3)
-                    
-                    with col_tone:
-                        fig_tone = render_quality_gauge(
-                            result.quality_score.tone_score,
-                            "Tone Score",
-                            "#3b82f6",
-                            dark_mode=st.session_state.dark_mode
-                        )
-                        st.plotly_chart(fig_tone, use_container_width=True)
-                    
-                    with col_professionalism:
-                        fig_professionalism = render_quality_gauge(
-                            result.quality_score.professionalism_score,
-                            "Professionalism", 
-                            "#10b981",
-                            dark_mode=st.session_state.dark_mode
-                        )
-                        st.plotly_chart(fig_professionalism, use_container_width=True)
-                    
-                    with col_resolution:
-                        fig_resolution = render_quality_gauge(
-                            result.quality_score.resolution_score,
-                            "Resolution Score",
-                            "#f59e0b",
-                            dark_mode=st.session_state.dark_mode
-                        )
-                        st.plotly_chart(fig_resolution, use_container_width=True)
+                    fig = build_quality_dashboard({
+                        "Tone Score": (result.quality_score.tone_score, "#3b82f6"),
+                        "Professionalism": (result.quality_score.professionalism_score, "#10b981"),
+                        "Resolution Score": (result.quality_score.resolution_score, "#f59e0b")
+                    }, dark_mode=st.session_state.dark_mode)
+                    # The gauges are read-only, so skip plotly.js interaction handling
+                    st.plotly_chart(fig, use_container_width=True, config={'staticPlot': True})
                     
                     # Feedback
                     if result.quality_score.feedback:
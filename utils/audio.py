@@ -0,0 +1,166 @@
+"""
+Audio helpers for the transcription path.
+
+Re-encoding needs the ffmpeg binary; splitting and silence trimming need the
+optional audio extra (pydub, webrtcvad) plus ffmpeg for compressed formats.
+Without them audio is uploaded to Whisper unchanged.
+"""
+
+import io
+import logging
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def preprocess_audio(content: bytes, speedup: float, timeout_s: float) -> Optional[bytes]:
+    """
+    Re-encode audio as 16 kHz mono 64 kbps MP3, optionally sped up, via ffmpeg.
+
+    Args:
+        content: Encoded audio in any format ffmpeg reads
+        speedup: Playback rate; 1.0 keeps the original tempo
+        timeout_s: Give up on ffmpeg after this many seconds
+
+    Returns:
+        MP3 bytes, or None when ffmpeg is unavailable or fails
+    """
+    command = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", "pipe:0"]
+    if speedup != 1.0:
+        command += ["-filter:a", f"atempo={speedup}"]
+    command += ["-ac", "1", "-ar", "16000", "-b:a", "64k", "-f", "mp3", "pipe:1"]
+
+    try:
+        result = subprocess.run(command, input=content, capture_output=True, timeout=timeout_s, check=True)
+    except FileNotFoundError:
+        logger.debug("ffmpeg not installed; uploading audio as-is")
+        return None
+    except subprocess.TimeoutExpired:
+        logger.warning("ffmpeg timed out after %.0fs; uploading audio as-is", timeout_s)
+        return None
+    except subprocess.CalledProcessError as e:
+        logger.warning("ffmpeg failed; uploading audio as-is: %s", e.stderr.decode(errors="replace").strip())
+        return None
+
+    return result.stdout or None
+
+
+def split_audio(
+    content: bytes,
+    file_name: Optional[str],
+    chunk_ms: int,
+    min_duration_ms: int
+) -> Optional[List[bytes]]:
+    """
+    Split audio into consecutive fixed-length MP3 chunks.
+
+    Args:
+        content: Encoded audio
+        file_name: Original file name, used to tell the decoder the format
+        chunk_ms: Length of each chunk in milliseconds
+        min_duration_ms: Audio this short or shorter is not split
+
+    Returns:
+        Chunks in order, or None when the audio should be sent whole
+        (too short, or it can't be decoded here)
+    """
+    try:
+        from pydub import AudioSegment
+        from pydub.exceptions import CouldntDecodeError, CouldntEncodeError
+    except ImportError:
+        logger.debug("pydub not installed; transcribing audio in one request")
+        return None
+
+    audio_format = Path(file_name).suffix.lstrip(".").lower() if file_name else None
+    try:
+        audio = AudioSegment.from_file(io.BytesIO(content), format=audio_format or None)
+        if len(audio) <= min_duration_ms:
+            return None
+
+        chunks = []
+        for start in range(0, len(audio), chunk_ms):
+            buffer = io.BytesIO()
+            audio[start:start + chunk_ms].export(buffer, format="mp3")
+            chunks.append(buffer.getvalue())
+        return chunks
+
+    # OSError covers a missing ffmpeg binary
+    except (CouldntDecodeError, CouldntEncodeError, OSError) as e:
+        logger.warning("Could not split audio; transcribing it in one request: %s", e)
+        return None
+
+
+def trim_silence(
+    content: bytes,
+    file_name: Optional[str],
+    frame_ms: int,
+    padding_ms: int,
+    aggressiveness: int
+) -> Optional[bytes]:
+    """
+    Drop non-speech stretches (hold music, dead air) using WebRTC VAD.
+
+    Each voiced frame keeps padding_ms of audio on either side, so words
+    aren't clipped at the cut points.
+
+    Args:
+        content: Encoded audio
+        file_name: Original file name, used to tell the decoder the format
+        frame_ms: VAD frame length; 10, 20 or 30 ms
+        padding_ms: Audio kept around each voiced frame
+        aggressiveness: VAD mode from 0 (keeps most) to 3 (drops most)
+
+    Returns:
+        Voiced audio as MP3, or None when nothing would be removed, no
+        speech was found, or the audio can't be processed here
+    """
+    try:
+        import webrtcvad
+        from pydub import AudioSegment
+        from pydub.exceptions import CouldntDecodeError, CouldntEncodeError
+    except ImportError:
+        logger.debug("webrtcvad/pydub not installed; skipping silence trimming")
+        return None
+
+    audio_format = Path(file_name).suffix.lstrip(".").lower() if file_name else None
+    try:
+        # WebRTC VAD takes 16-bit mono PCM at one of a few fixed rates
+        audio = AudioSegment.from_file(io.BytesIO(content), format=audio_format or None)
+        audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
+
+        vad = webrtcvad.Vad(aggressiveness)
+        raw = audio.raw_data
+        frame_bytes = 16000 * 2 * frame_ms // 1000
+        voiced = [
+            vad.is_speech(raw[offset:offset + frame_bytes], 16000)
+            for offset in range(0, len(raw) - frame_bytes + 1, frame_bytes)
+        ]
+
+        # Merge voiced frames, widened by the padding, into [start, end) ms ranges
+        ranges: List[List[int]] = []
+        for index, is_speech in enumerate(voiced):
+            if not is_speech:
+                continue
+            start = max(0, index * frame_ms - padding_ms)
+            end = min(len(audio), (index + 1) * frame_ms + padding_ms)
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+
+        kept_ms = sum(end - start for start, end in ranges)
+        if not ranges or kept_ms >= len(audio):
+            return None
+
+        trimmed = sum((audio[start:end] for start, end in ranges[1:]), audio[ranges[0][0]:ranges[0][1]])
+        buffer = io.BytesIO()
+        trimmed.export(buffer, format="mp3")
+        logger.info("Trimmed silence: kept %d of %d ms", kept_ms, len(audio))
+        return buffer.getvalue()
+
+    # OSError covers a missing ffmpeg binary
+    except (CouldntDecodeError, CouldntEncodeError, OSError) as e:
+        logger.warning("Could not trim silence; uploading audio as-is: %s", e)
+        return None
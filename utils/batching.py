@@ -0,0 +1,142 @@
+"""
+Dynamic micro-batching for concurrent LLM requests.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+from utils.constants import (
+    BATCH_PROMPT_MAX_TOKENS,
+    DEFAULT_BATCH_WAIT_TIMEOUT_S,
+    DEFAULT_MAX_BATCH_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# (transcript, prompt tokens, future awaiting its result)
+_Request = Tuple[str, int, "asyncio.Future[Any]"]
+
+
+class AsyncDynamicBatchScorer(Generic[T]):
+    """
+    Collect concurrent scoring requests into batched LLM requests.
+
+    Requests submitted within ``batch_wait_timeout_s`` of each other are
+    grouped, up to ``max_batch_size`` transcripts and ``max_batch_tokens``
+    prompt tokens, and scored by a single ``score_batch_fn`` call that returns
+    one result per transcript, in order. An error fails every request in its
+    batch.
+    """
+
+    def __init__(
+        self,
+        score_batch_fn: Callable[[List[str]], Awaitable[List[T]]],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_wait_timeout_s: float = DEFAULT_BATCH_WAIT_TIMEOUT_S,
+        max_batch_tokens: int = BATCH_PROMPT_MAX_TOKENS
+    ):
+        self._score_batch_fn = score_batch_fn
+        self.max_batch_size = max_batch_size
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        self.max_batch_tokens = max_batch_tokens
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Strong references, so in-flight batches aren't garbage-collected mid-call
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def submit(self, transcript: str, tokens: int = 0) -> T:
+        """Queue a transcript of ``tokens`` prompt tokens for scoring and wait for its result."""
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((transcript, tokens, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop batching, cancelling queued requests and batches still in flight."""
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+        dispatches = list(self._dispatches)
+        for task in dispatches:
+            task.cancel()
+        await asyncio.gather(*dispatches, return_exceptions=True)
+
+        while self._queue and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            future.cancel()
+        self._worker = None
+        self._queue = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Start the batching task on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """Drain the queue into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        # A request that would have overflowed the previous batch's token budget
+        carry: Optional[_Request] = None
+        batch: List[_Request] = []
+        try:
+            while True:
+                batch = [carry or await queue.get()]
+                carry = None
+                tokens = batch[0][1]
+                deadline = loop.time() + self.batch_wait_timeout_s
+
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if tokens + request[1] > self.max_batch_tokens:
+                        carry = request
+                        break
+                    batch.append(request)
+                    tokens += request[1]
+
+                # Dispatch without blocking collection of the next batch
+                task = loop.create_task(self._dispatch(batch))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+                batch = []
+        except asyncio.CancelledError:
+            for _, _, future in batch + ([carry] if carry else []):
+                future.cancel()
+            raise
+
+    async def _dispatch(self, batch: List[_Request]) -> None:
+        """Score one batch in a single call and resolve the waiting futures."""
+        logger.debug("Dispatching scoring batch of %d", len(batch))
+        futures = [future for _, _, future in batch]
+        try:
+            results = await self._score_batch_fn([transcript for transcript, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Expected {len(batch)} results, got {len(results)}")
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
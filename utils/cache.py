@@ -0,0 +1,62 @@
+"""
+Exact-match result cache keyed on a digest of the canonical input.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Generic, Optional, Sequence, TypeVar
+
+import orjson
+from langchain_core.messages import BaseMessage
+
+T = TypeVar("T")
+
+
+class ExactMatchCache(Generic[T]):
+    """
+    In-process LRU cache of model results for byte-identical inputs.
+
+    Keys from key() are SHA-256 digests of the messages plus the sampling
+    parameters, so a replayed transcript (retries, duplicate uploads) skips
+    the LLM; other inputs, such as audio, can be keyed by their own digest.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, T] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(messages: Sequence[BaseMessage], **params: Any) -> str:
+        """
+        Hash a prompt canonically.
+
+        Args:
+            messages: Messages sent to the model
+            params: Settings that affect the response (model, temperature, ...)
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = {
+            "messages": [(message.type, message.content) for message in messages],
+            **params
+        }
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[T]:
+        """Return the cached result for a key, if any."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: T) -> None:
+        """Store a result, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,159 @@
+"""
+Shared LLM and OpenAI SDK client construction.
+"""
+
+import asyncio
+import atexit
+import logging
+from functools import lru_cache
+from typing import Callable, Tuple, Type, TypeVar
+
+import httpx
+from langchain_openai import ChatOpenAI
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, OpenAI, RateLimitError
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from config.settings import get_config
+from utils.constants import (
+    HTTP_KEEPALIVE_EXPIRY_S,
+    LLM_RETRY_ATTEMPTS,
+    LLM_RETRY_INITIAL_S,
+    LLM_RETRY_MAX_S,
+)
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+# Rate limits, dropped connections/timeouts and 5xx responses are worth retrying;
+# authentication and bad-request errors are not
+TRANSIENT_LLM_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+# Whisper can take minutes to answer for long recordings
+_TRANSCRIPTION_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+
+@lru_cache(maxsize=1)
+def _http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Build the process-wide HTTP/2 pools on first use, sized from the config.
+
+    HTTP/2 multiplexes concurrent requests over a single TCP+TLS connection,
+    so parallel scoring doesn't pay a handshake per call. Idle connections
+    outlive the gap between pipeline stages and between calls (httpx drops
+    them after 5 s by default), so uploads rarely re-handshake.
+    """
+    pool_size = get_config().model.http_pool_size
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_S
+    )
+    sync_client = httpx.Client(http2=True, timeout=_HTTP_TIMEOUT, limits=limits)
+    async_client = httpx.AsyncClient(http2=True, timeout=_HTTP_TIMEOUT, limits=limits)
+    atexit.register(_close_http_clients, sync_client, async_client)
+    return sync_client, async_client
+
+
+def _close_http_clients(sync_client: httpx.Client, async_client: httpx.AsyncClient) -> None:
+    """Close the shared HTTP clients at interpreter exit."""
+    sync_client.close()
+    try:
+        asyncio.run(async_client.aclose())
+    except Exception as e:
+        logger.debug("Async HTTP client close skipped: %s", e)
+
+
+@lru_cache(maxsize=8)
+def get_chat_model(model: str, temperature: float, api_key: str) -> ChatOpenAI:
+    """
+    Get a shared ChatOpenAI client for the given settings.
+
+    Agents built with the same settings reuse one client, and all clients
+    share the process-wide HTTP/2 connection pools.
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        api_key: OpenAI API key
+
+    Returns:
+        Cached ChatOpenAI instance
+    """
+    http_client, http_async_client = _http_clients()
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=api_key,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
+
+
+@lru_cache(maxsize=8)
+def get_openai_client(api_key: str) -> OpenAI:
+    """
+    Get a shared OpenAI SDK client (used for Whisper) on the process-wide HTTP/2 pool.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Cached OpenAI instance
+    """
+    return OpenAI(api_key=api_key, http_client=_http_clients()[0], timeout=_TRANSCRIPTION_TIMEOUT)
+
+
+@lru_cache(maxsize=8)
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """
+    Async counterpart of get_openai_client.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Cached AsyncOpenAI instance
+    """
+    return AsyncOpenAI(api_key=api_key, http_client=_http_clients()[1], timeout=_TRANSCRIPTION_TIMEOUT)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """Log each failed LLM attempt before backing off."""
+    logger.warning(
+        "%s failed (attempt %d/%d), retrying in %.1fs: %s",
+        retry_state.fn.__qualname__,
+        retry_state.attempt_number,
+        LLM_RETRY_ATTEMPTS,
+        retry_state.next_action.sleep,
+        retry_state.outcome.exception()
+    )
+
+
+def llm_retry(*extra_errors: Type[BaseException]) -> Callable[[F], F]:
+    """
+    Retry decorator for LLM calls, for sync and async functions alike.
+
+    Retries transient API errors with jittered exponential backoff and
+    re-raises the last error once attempts run out.
+
+    Args:
+        extra_errors: Further exception types to retry (e.g. invalid output)
+
+    Returns:
+        Decorator
+    """
+    return retry(
+        retry=retry_if_exception_type(TRANSIENT_LLM_ERRORS + extra_errors),
+        wait=wait_exponential_jitter(initial=LLM_RETRY_INITIAL_S, max=LLM_RETRY_MAX_S),
+        stop=stop_after_attempt(LLM_RETRY_ATTEMPTS),
+        before_sleep=_log_retry,
+        reraise=True
+    )
@@ -6,9 +6,18 @@ Constants used throughout the application.
 MAX_FILE_SIZE_MB = 100
 MAX_TRANSCRIPT_LENGTH = 50000
 
+# Prompt token budgeting
+MAX_TRANSCRIPT_TOKENS = 8000  # Default for config.model.max_prompt_tokens
+MIN_TRANSCRIPT_TOKENS = 20  # Below this there is nothing worth sending to the LLM
+BATCH_PROMPT_MAX_TOKENS = 32_000  # Transcript tokens packed into one batched request
+MAP_REDUCE_CHUNK_TOKENS = 4000  # Window size when summarizing long calls in parts
+DEFAULT_TOKEN_ENCODING = "o200k_base"
+CHARS_PER_TOKEN_ESTIMATE = 4  # Used when no tokenizer is available
+TRUNCATION_MARKER = "\n\n[... transcript truncated ...]\n\n"
+
 # Audio file extensions
-AUDIO_EXTENSIONS = ['mp3', 'wav', 'm4a', 'ogg', 'webm']
-TEXT_EXTENSIONS = ['txt', 'json']
+AUDIO_EXTENSIONS = frozenset({'mp3', 'wav', 'm4a', 'ogg', 'webm'})
+TEXT_EXTENSIONS = frozenset({'txt', 'json'})
 
 # Quality score thresholds
 QUALITY_SCORE_EXCELLENT = 9.0
@@ -44,6 +53,30 @@ STATUS_FAILED = "failed"
 # Retry configuration
 DEFAULT_MAX_RETRIES = 2
 DEFAULT_RETRY_DELAY = 1.0
+# Transient API errors (rate limits, connection drops) are retried with jittered backoff
+LLM_RETRY_ATTEMPTS = 4
+LLM_RETRY_INITIAL_S = 0.5
+LLM_RETRY_MAX_S = 8.0
+
+# HTTP connection reuse
+HTTP_KEEPALIVE_EXPIRY_S = 30.0
+
+# Result caching
+SCORE_CACHE_MAX_ENTRIES = 10_000
+SUMMARY_CACHE_MAX_ENTRIES = 1_024
+SEMANTIC_CACHE_MAX_ENTRIES = 100_000
+SEMANTIC_CACHE_THRESHOLD = 0.95  # Cosine similarity for a near-duplicate hit
+SEMANTIC_CACHE_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# The encoder truncates at 256 word pieces, so transcripts are embedded in windows and mean-pooled
+SEMANTIC_CACHE_CHUNK_WORDS = 150
+# A semantic hit must also share most of its vocabulary and be of similar length
+SEMANTIC_CACHE_MIN_TOKEN_OVERLAP = 0.8  # Estimated Jaccard similarity of word sets
+SEMANTIC_CACHE_MIN_LENGTH_RATIO = 0.9  # Shorter word count / longer word count
+SEMANTIC_CACHE_SKETCH_SIZE = 128  # Smallest word hashes kept per entry to estimate overlap
+
+# Dynamic batching
+DEFAULT_MAX_BATCH_SIZE = 16
+DEFAULT_BATCH_WAIT_TIMEOUT_S = 0.002
 
 # UI Progress milestones
 PROGRESS_INIT = 10
@@ -56,12 +89,29 @@ PROGRESS_COMPLETE = 100
 # Logging formats
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Third-party loggers held at WARNING; they are too chatty at INFO
+QUIET_LOGGERS = ("httpx", "httpcore", "openai", "urllib3", "requests", "langsmith")
 
 # Model defaults
-DEFAULT_LLM_MODEL = "gpt-4-turbo-preview"
-DEFAULT_LLM_TEMPERATURE = 0.3
+DEFAULT_LLM_MODEL = "gpt-4o-mini"
+# Cheapest first; a model escalates to the next one when its output fails validation,
+# its scores look suspiciously uniform (quality) or its summary is empty (summarization)
+MODEL_CASCADE = ["gpt-4o-mini", "gpt-4o"]
+LOW_CONFIDENCE_SCORE_SPREAD = 1.0  # |tone - professionalism| + |professionalism - resolution|
+# Routes summary requests to the same OpenAI cache shards; change it with the prompt
+SUMMARY_PROMPT_CACHE_KEY = "call-summary-v1"
 DEFAULT_TRANSCRIPTION_MODEL = "nova-2"
 
+# Chunked transcription: Whisper's 30 s window; shorter audio isn't worth splitting
+TRANSCRIPTION_CHUNK_MS = 30_000
+CHUNKED_TRANSCRIPTION_MIN_MS = 60_000
+AUDIO_PREPROCESS_TIMEOUT_S = 120
+
+# Silence trimming: 30 ms VAD frames, 100 ms kept around speech so words aren't clipped
+VAD_FRAME_MS = 30
+VAD_PADDING_MS = 100
+VAD_AGGRESSIVENESS = 2  # 0 (keeps most audio) to 3 (drops most)
+
 # UI Theme colors
 THEME_PRIMARY = "#3b82f6"
 THEME_SUCCESS = "#16a34a"
@@ -23,6 +23,11 @@ class QualityScoringError(CallProcessingError):
     pass
 
 
+class AnalysisError(CallProcessingError):
+    """Error during combined summary and quality analysis."""
+    pass
+
+
 class ConfigurationError(CallProcessingError):
     """Error in configuration or missing requirements."""
     pass
@@ -2,12 +2,32 @@
 Helper utilities for common operations.
 """
 
-import json
 import logging
-from typing import Any, Dict, Optional
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import orjson
+import tiktoken
+from pydantic import BaseModel
+
+from utils.constants import (
+    CHARS_PER_TOKEN_ESTIMATE,
+    DEFAULT_TOKEN_ENCODING,
+    TRUNCATION_MARKER,
+)
 
 logger = logging.getLogger(__name__)
 
+# Matches a whole response wrapped in a markdown code fence, capturing the body
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL | re.IGNORECASE)
+
+
+def strip_code_fence(content: str) -> bytes:
+    """Strip a surrounding markdown code fence in a single regex pass, returning raw bytes."""
+    match = _FENCE_RE.match(content)
+    return (match.group(1) if match else content.strip()).encode()
+
 
 def parse_llm_json_response(content: str, fallback: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
@@ -23,47 +43,156 @@ def parse_llm_json_response(content: str, fallback: Optional[Dict[str, Any]] = N
     if not content:
         return fallback or {}
     
-    # Clean content
-    content = content.strip()
-    
-    # Remove common markdown code block wrappers
-    if content.startswith('```json'):
-        content = content.replace('```json', '').replace('```', '').strip()
-    elif content.startswith('```'):
-        content = content.replace('```', '').strip()
-    
-    # Remove any potential backticks
-    content = content.replace('`', '')
+    # Remove markdown code block wrappers; orjson parses the bytes directly
+    raw = strip_code_fence(content)
     
     try:
-        result = json.loads(content)
-        
-        # Special handling for feedback field if it's a dictionary
-        if isinstance(result, dict) and 'feedback' in result:
-            if isinstance(result['feedback'], dict):
-                # Convert dictionary feedback to string
-                feedback_dict = result['feedback']
-                feedback_parts = []
-                for key, value in feedback_dict.items():
-                    if isinstance(value, str):
-                        feedback_parts.append(f"{key.title()}: {value}")
-                    elif isinstance(value, (list, dict)):
-                        feedback_parts.append(f"{key.title()}: {json.dumps(value)}")
-                result['feedback'] = " ".join(feedback_parts)
-                logger.warning("Converted dictionary feedback to string format")
-        
-        return result
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON parsing error: {str(e)}, Content preview: {content[:200]}...")
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError as e:
+        logger.error("JSON parsing error: %s, Content preview: %.200s...", e, content)
         if fallback:
             logger.info("Using fallback response")
             return fallback
         raise
 
 
+class JsonObjectScanner:
+    """
+    Incrementally track a streamed JSON object to detect when it is complete.
+    
+    Braces inside string values are ignored, so ``feed`` only reports completion
+    once the top-level object has actually closed.
+    """
+    
+    def __init__(self) -> None:
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, chunk: str) -> Optional[int]:
+        """Consume a chunk; once the top-level object closes, return the offset in it just past the brace."""
+        for offset, char in enumerate(chunk):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+                self.started = True
+            elif char == "}":
+                self.depth -= 1
+                if self.started and self.depth == 0:
+                    return offset + 1
+        return None
 
 
+@lru_cache(maxsize=8)
+def get_token_encoder(model: str) -> Optional[tiktoken.Encoding]:
+    """
+    Get the tiktoken encoder for a model, built once per model.
+    
+    Args:
+        model: Model name
+        
+    Returns:
+        Encoder, or None if it cannot be loaded (e.g. BPE files unavailable offline)
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_TOKEN_ENCODING)
+    except Exception as e:
+        logger.warning("Token encoder unavailable for %s, estimating from characters: %s", model, e)
+        return None
 
 
+def truncate_to_token_budget(text: str, model: str, max_tokens: int) -> Tuple[str, int]:
+    """
+    Bound text to a token budget, keeping its head and tail.
+    
+    Args:
+        text: Text to truncate
+        model: Model whose tokenizer defines the budget
+        max_tokens: Maximum tokens to keep
+        
+    Returns:
+        Tuple of (possibly truncated text, original token count)
+    """
+    half = max_tokens // 2
+    encoder = get_token_encoder(model)
+    
+    if encoder is None:
+        token_count = len(text) // CHARS_PER_TOKEN_ESTIMATE
+        if token_count <= max_tokens:
+            return text, token_count
+        half_chars = half * CHARS_PER_TOKEN_ESTIMATE
+        return f"{text[:half_chars]}{TRUNCATION_MARKER}{text[-half_chars:]}", token_count
+    
+    tokens = encoder.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text, len(tokens)
+    return (
+        f"{encoder.decode(tokens[:half])}{TRUNCATION_MARKER}{encoder.decode(tokens[-half:])}",
+        len(tokens)
+    )
 
 
+def split_to_token_budget(text: str, model: str, max_tokens: int) -> List[str]:
+    """
+    Split text into consecutive chunks of at most max_tokens tokens.
+    
+    Args:
+        text: Text to split
+        model: Model whose tokenizer defines the budget
+        max_tokens: Maximum tokens per chunk
+        
+    Returns:
+        Chunks in order
+    """
+    encoder = get_token_encoder(model)
+    
+    if encoder is None:
+        step = max_tokens * CHARS_PER_TOKEN_ESTIMATE
+        return [text[i:i + step] for i in range(0, len(text), step)]
+    
+    tokens = encoder.encode(text, disallowed_special=())
+    return [encoder.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens)]
+
+
+def json_schema_response_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Build a strict structured-outputs response_format for a pydantic model.
+    
+    Strict mode requires every object to list all of its properties as
+    required and to forbid additional properties, including nested models.
+    
+    Args:
+        model: Pydantic model the response must match
+        
+    Returns:
+        response_format payload for the chat completions API
+    """
+    def _strict(node: Any) -> None:
+        if isinstance(node, dict):
+            if node.get("type") == "object" and "properties" in node:
+                node["required"] = list(node["properties"])
+                node["additionalProperties"] = False
+            for value in node.values():
+                _strict(value)
+        elif isinstance(node, list):
+            for value in node:
+                _strict(value)
+    
+    schema = model.model_json_schema()
+    _strict(schema)
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__.lstrip("_"), "schema": schema, "strict": True}
+    }
@@ -0,0 +1,246 @@
+"""
+Semantic response cache for near-duplicate transcripts.
+
+Two tiers: an exact SHA-256 match on the transcript, then a cosine-similarity
+search over sentence embeddings. Transcripts are lowercased and their
+whitespace collapsed first, so formatting-only differences still hit. The
+semantic tier needs the optional ``semantic-cache`` extra (faiss-cpu,
+sentence-transformers); without it only the exact tier is used.
+
+The embedding covers the whole call, mean-pooled over fixed word windows,
+and a semantic hit must also pass a word-overlap and length check, so calls
+that merely share a scripted greeting or disclosure don't match.
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+from utils.constants import (
+    SEMANTIC_CACHE_CHUNK_WORDS,
+    SEMANTIC_CACHE_EMBEDDING_MODEL,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_MIN_LENGTH_RATIO,
+    SEMANTIC_CACHE_MIN_TOKEN_OVERLAP,
+    SEMANTIC_CACHE_SKETCH_SIZE,
+    SEMANTIC_CACHE_THRESHOLD,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Bumped whenever the saved layout or the embedding scheme changes
+_PERSIST_FORMAT = 2
+
+
+class SemanticCache(Generic[T]):
+    """
+    Cache analysis results by transcript, tolerating near-duplicates.
+
+    ``namespace`` should identify everything besides the transcript that
+    affects the result (model, temperature, prompt version), so entries from
+    different configurations never collide. The embedding model is added to
+    it here. ``encoder`` replaces the SentenceTransformer loaded from
+    ``embedding_model``, e.g. to share one already in memory.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        embedding_model: str = SEMANTIC_CACHE_EMBEDDING_MODEL,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        persist_path: Optional[str] = None,
+        encoder: Optional[Any] = None
+    ):
+        self.namespace = f"{namespace}|embedding={embedding_model}"
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self._lock = threading.Lock()
+
+        # Exact tier: SHA-256(namespace + transcript) -> result
+        self._exact: OrderedDict[str, T] = OrderedDict()
+
+        # Semantic tier: inner-product index over L2-normalized embeddings,
+        # with results and their word fingerprints stored in insertion order alongside it
+        self._encoder = None
+        self._index = None
+        self._values: List[T] = []
+        self._fingerprints: List[Tuple[int, Any]] = []
+        try:
+            import faiss
+
+            if encoder is None:
+                from sentence_transformers import SentenceTransformer
+                encoder = SentenceTransformer(embedding_model)
+            self._encoder = encoder
+            self._index = faiss.IndexFlatIP(self._encoder.get_sentence_embedding_dimension())
+        except ImportError:
+            logger.info("Semantic cache extras not installed; using exact-match caching only")
+
+        if persist_path:
+            self._load()
+            atexit.register(self.save)
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether near-duplicate lookups are available."""
+        return self._index is not None
+
+    def get(self, transcript: str) -> Optional[T]:
+        """Return a cached result for this or a near-identical transcript."""
+        transcript = self._normalize(transcript)
+        key = self._exact_key(transcript)
+        with self._lock:
+            if key in self._exact:
+                self._exact.move_to_end(key)
+                return self._exact[key]
+
+        if not self.semantic_enabled:
+            return None
+
+        embedding = self._embed(transcript)
+        fingerprint = self._fingerprint(transcript)
+        with self._lock:
+            if self._index.ntotal == 0:
+                return None
+            scores, ids = self._index.search(embedding, 1)
+            if scores[0, 0] < self.threshold:
+                return None
+            match = ids[0, 0]
+            if not self._same_words(fingerprint, self._fingerprints[match]):
+                logger.debug("Semantic cache near-miss (similarity %.3f, different wording)", scores[0, 0])
+                return None
+            logger.debug("Semantic cache hit (similarity %.3f)", scores[0, 0])
+            return self._values[match]
+
+    def put(self, transcript: str, value: T) -> None:
+        """Store a result for a transcript in both tiers."""
+        transcript = self._normalize(transcript)
+        key = self._exact_key(transcript)
+        embedding = fingerprint = None
+        if self.semantic_enabled:
+            embedding = self._embed(transcript)
+            fingerprint = self._fingerprint(transcript)
+
+        with self._lock:
+            self._exact[key] = value
+            self._exact.move_to_end(key)
+            if len(self._exact) > self.max_entries:
+                self._exact.popitem(last=False)
+
+            # Flat indexes can't delete cheaply, so the semantic tier stops growing at capacity
+            if embedding is not None and self._index.ntotal < self.max_entries:
+                self._index.add(embedding)
+                self._values.append(value)
+                self._fingerprints.append(fingerprint)
+
+    def save(self) -> None:
+        """Persist the cache to ``persist_path`` (index file plus a pickle sidecar)."""
+        if not self.persist_path:
+            return
+
+        with self._lock:
+            state = {
+                "format": _PERSIST_FORMAT,
+                "namespace": self.namespace,
+                "exact": self._exact,
+                "values": self._values,
+                "fingerprints": self._fingerprints,
+            }
+            # Write each file beside its target and swap it in, so a save cut
+            # short at exit never leaves a truncated cache behind
+            if self.semantic_enabled:
+                import faiss
+                index_path = f"{self.persist_path}.faiss"
+                faiss.write_index(self._index, f"{index_path}.tmp")
+                os.replace(f"{index_path}.tmp", index_path)
+            sidecar = f"{self.persist_path}.pkl"
+            with open(f"{sidecar}.tmp", "wb") as f:
+                pickle.dump(state, f)
+            os.replace(f"{sidecar}.tmp", sidecar)
+
+    def _load(self) -> None:
+        """Load a previously saved cache for the same namespace, if present."""
+        sidecar = f"{self.persist_path}.pkl"
+        if not os.path.exists(sidecar):
+            return
+
+        try:
+            with open(sidecar, "rb") as f:
+                state = pickle.load(f)
+            if state.get("format") != _PERSIST_FORMAT or state.get("namespace") != self.namespace:
+                logger.info("Ignoring semantic cache saved for a different configuration")
+                return
+            self._exact = state["exact"]
+
+            index_path = f"{self.persist_path}.faiss"
+            if self.semantic_enabled and os.path.exists(index_path):
+                import faiss
+                index = faiss.read_index(index_path)
+                # The two files are replaced separately; only use them if they still agree
+                if (
+                    index.d == self._index.d
+                    and index.ntotal == len(state["values"]) == len(state["fingerprints"])
+                ):
+                    self._index = index
+                    self._values = state["values"]
+                    self._fingerprints = state["fingerprints"]
+                else:
+                    logger.warning("Ignoring semantic index at %s that doesn't match its sidecar", index_path)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError, KeyError, AttributeError) as e:
+            logger.warning("Could not load semantic cache from %s: %s", sidecar, e)
+
+    @staticmethod
+    def _normalize(transcript: str) -> str:
+        """Canonicalize case and whitespace."""
+        return " ".join(transcript.lower().split())
+
+    def _exact_key(self, transcript: str) -> str:
+        """Hash the transcript together with the namespace."""
+        return hashlib.sha256(f"{self.namespace}\0{transcript}".encode()).hexdigest()
+
+    def _embed(self, transcript: str) -> Any:
+        """Embed a whole transcript as a normalized float32 row vector, mean-pooled over word windows."""
+        words = transcript.split()
+        windows = [
+            " ".join(words[i:i + SEMANTIC_CACHE_CHUNK_WORDS])
+            for i in range(0, len(words), SEMANTIC_CACHE_CHUNK_WORDS)
+        ] or [transcript]
+        vectors = self._encoder.encode(windows, normalize_embeddings=True)
+        pooled = vectors.mean(axis=0, keepdims=True)
+        return (pooled / max(float((pooled ** 2).sum()) ** 0.5, 1e-12)).astype("float32")
+
+    @staticmethod
+    def _fingerprint(transcript: str) -> Tuple[int, Any]:
+        """Word count plus a bottom-k sketch (the smallest word hashes) of the transcript's vocabulary."""
+        import numpy as np
+
+        words = transcript.split()
+        hashes = np.unique(np.fromiter(
+            (int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "little") for word in set(words)),
+            dtype=np.uint64
+        ))
+        return len(words), hashes[:SEMANTIC_CACHE_SKETCH_SIZE]
+
+    @staticmethod
+    def _same_words(a: Tuple[int, Any], b: Tuple[int, Any]) -> bool:
+        """Whether two fingerprints have similar lengths and mostly the same vocabulary."""
+        import numpy as np
+
+        (length_a, sketch_a), (length_b, sketch_b) = a, b
+        if min(length_a, length_b) < SEMANTIC_CACHE_MIN_LENGTH_RATIO * max(length_a, length_b):
+            return False
+        # Of the k smallest hashes across both sketches, the share found in both estimates Jaccard similarity
+        union = np.union1d(sketch_a, sketch_b)[:SEMANTIC_CACHE_SKETCH_SIZE]
+        if union.size == 0:
+            return True
+        shared = np.intersect1d(union, np.intersect1d(sketch_a, sketch_b, assume_unique=True), assume_unique=True)
+        return shared.size / union.size >= SEMANTIC_CACHE_MIN_TOKEN_OVERLAP
@@ -6,7 +6,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, field_validator
 
 
 class InputType(str, Enum):
@@ -19,17 +20,19 @@ class CallInput(BaseModel):
     """Input model for call data validation."""
     
     input_type: InputType
-    content: Any  # bytes for audio, str for text transcripts
+    content: Any  # bytes or a Path for audio, str for text transcripts
     file_name: Optional[str] = None
 
 
 class CallSummary(BaseModel):
     """Simplified summary of a call."""
     
-    summary: str
-    key_points: List[str]
+    # Field order is the order strict structured outputs emit keys in; routing
+    # fields come first so streamed partials can act on them early
     sentiment: Literal["positive", "neutral", "negative"]
     outcome: Literal["resolved", "escalated", "follow_up", "unresolved"]
+    summary: str
+    key_points: List[str]
 
 
 
@@ -41,6 +44,20 @@ class QualityScore(BaseModel):
     professionalism_score: float = Field(ge=1.0, le=10.0)
     resolution_score: float = Field(ge=1.0, le=10.0)
     feedback: str
+    
+    @field_validator("feedback", mode="before")
+    @classmethod
+    def _flatten_feedback(cls, value: Any) -> Any:
+        """Flatten feedback the LLM returned as an object into a single string."""
+        if not isinstance(value, dict):
+            return value
+        parts = []
+        for key, item in value.items():
+            if isinstance(item, str):
+                parts.append(f"{key.title()}: {item}")
+            elif isinstance(item, (list, dict)):
+                parts.append(f"{key.title()}: {orjson.dumps(item).decode()}")
+        return " ".join(parts)
 
 
 class AgentState(BaseModel):
@@ -49,6 +66,9 @@ class AgentState(BaseModel):
     call_id: str
     input_data: CallInput
     transcript_text: Optional[str] = None
+    # Transcript bounded to the prompt token budget, computed once and shared by the LLM agents
+    prompt_transcript: Optional[str] = None
+    transcript_tokens: Optional[int] = None
     summary: Optional[CallSummary] = None
     quality_score: Optional[QualityScore] = None
     errors: List[Dict[str, Any]] = Field(default_factory=list)
@@ -2,20 +2,35 @@
 Simplified LangGraph workflow for call processing.
 """
 
+import asyncio
 import logging
 import os
 import time
 import uuid
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
 
 from agents import (
+    CombinedAnalysisAgent,
     QualityScoringAgent,
     SummarizationAgent,
     TranscriptionAgent,
 )
-from utils.validation import AgentState, ProcessingResult, CallInput, InputType
+from agents.base_agent import get_agent_executor
+from agents.prompts import PROMPTS_DIGEST
+from config.settings import get_config
+from utils.semantic_cache import SemanticCache
+from utils.validation import (
+    AgentState,
+    CallInput,
+    CallSummary,
+    InputType,
+    ProcessingResult,
+    QualityScore,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -27,64 +42,87 @@ class CallCenterWorkflow:
     
     def __init__(
         self,
-        openai_api_key: Optional[str] = None
+        openai_api_key: Optional[str] = None,
+        combined_analysis: bool = False,
+        semantic_cache: Optional[bool] = None,
+        llm: Optional[BaseChatModel] = None
     ):
         # Initialize transcription agent with OpenAI Whisper
         self.transcription_agent = TranscriptionAgent(
             openai_api_key=openai_api_key
         )
+        # LLM agents share one pooled client: the injected llm, or get_chat_model's cached one
         self.summarization_agent = SummarizationAgent(
             model_provider="openai",
-            api_key=openai_api_key
+            api_key=openai_api_key,
+            llm=llm
         )
         self.quality_agent = QualityScoringAgent(
             model_provider="openai",
-            api_key=openai_api_key
+            api_key=openai_api_key,
+            llm=llm
         )
         
+        # Optionally produce summary and scores from one LLM call instead of two
+        self.combined_agent: Optional[CombinedAnalysisAgent] = None
+        if combined_analysis:
+            self.combined_agent = CombinedAnalysisAgent(
+                model_provider="openai",
+                api_key=openai_api_key,
+                llm=llm
+            )
+        
+        # Reuse results for repeated or near-duplicate transcripts
+        config = get_config()
+        self.result_cache: Optional[SemanticCache[Tuple[CallSummary, QualityScore]]] = None
+        if config.model.semantic_cache if semantic_cache is None else semantic_cache:
+            self.result_cache = SemanticCache(
+                namespace=self._result_cache_namespace(),
+                persist_path=config.model.semantic_cache_path
+            )
+        
         # Build the graph
         self.graph = self._build_graph()
     
+    def _result_cache_namespace(self) -> str:
+        """Identify the models, temperature and prompts that produced cached results."""
+        if self.combined_agent:
+            models = f"combined={self.combined_agent.model_name}"
+        else:
+            summary_models = ",".join(model for model, _ in self.summarization_agent._llm_cascade)
+            quality_models = ",".join(model for model, _ in self.quality_agent._llm_cascade)
+            models = f"summary={summary_models}|quality={quality_models}"
+        return f"{models}|{self.summarization_agent.temperature}|prompts={PROMPTS_DIGEST}"
+    
     def _build_graph(self):
         """Build simplified LangGraph workflow."""
         graph = StateGraph(AgentState)
         
-        # Add nodes
-        graph.add_node("transcription", self._run_transcription)
-        graph.add_node("summarization", self._run_summarization)
-        graph.add_node("quality_scoring", self._run_quality_scoring)
+        # Add nodes; summarization and quality scoring only need the transcript,
+        # so they run concurrently in a single analysis node
+        graph.add_node("transcription", RunnableLambda(self._run_transcription, afunc=self._arun_transcription))
+        graph.add_node("analysis", RunnableLambda(self._run_analysis, afunc=self._arun_analysis))
         
         # Simple linear flow with retry logic
         graph.set_entry_point("transcription")
         
-        # retry twice, before going to summarization
+        # retry twice, before going to analysis
         graph.add_conditional_edges(
             "transcription",
             self._route_after_transcription,
             {
                 "retry": "transcription",
-                "continue": "summarization",
-                "end": END
-            }
-        )
-        
-        # retry twice, before going to quality scoring
-        graph.add_conditional_edges(
-            "summarization",
-            self._route_after_summarization,
-            {
-                "retry": "summarization",
-                "continue": "quality_scoring",
+                "continue": "analysis",
                 "end": END
             }
         )
         
-        # retry twice, and then end
+        # retry failed analysis agents twice, and then end
         graph.add_conditional_edges(
-            "quality_scoring",
-            self._route_after_quality_scoring,
+            "analysis",
+            self._route_after_analysis,
             {
-                "retry": "quality_scoring",
+                "retry": "analysis",
                 "end": END
             }
         )
@@ -93,14 +131,25 @@ class CallCenterWorkflow:
     
     def _run_transcription(self, state: AgentState) -> AgentState:
         """Run transcription with validation."""
+        self._record_attempt(state, "transcription")
         try:
             return self.transcription_agent.process(state)
         except Exception as e:
             state.add_error("transcription", str(e))
             return state
     
+    async def _arun_transcription(self, state: AgentState) -> AgentState:
+        """Run transcription on the event loop."""
+        self._record_attempt(state, "transcription")
+        try:
+            return await self.transcription_agent.aprocess(state)
+        except Exception as e:
+            state.add_error("transcription", str(e))
+            return state
+    
     def _run_summarization(self, state: AgentState) -> AgentState:
         """Run summarization."""
+        self._record_attempt(state, "summarization")
         try:
             return self.summarization_agent.process(state)
         except Exception as e:
@@ -109,12 +158,123 @@ class CallCenterWorkflow:
     
     def _run_quality_scoring(self, state: AgentState) -> AgentState:
         """Run quality scoring."""
+        self._record_attempt(state, "quality_scoring")
         try:
             return self.quality_agent.process(state)
         except Exception as e:
             state.add_error("quality_scoring", str(e))
             return state
     
+    async def _arun_summarization(self, state: AgentState) -> AgentState:
+        """Run summarization on the event loop."""
+        self._record_attempt(state, "summarization")
+        try:
+            return await self.summarization_agent.aprocess(state)
+        except Exception as e:
+            state.add_error("summarization", str(e))
+            return state
+    
+    async def _arun_quality_scoring(self, state: AgentState) -> AgentState:
+        """Run quality scoring on the event loop."""
+        self._record_attempt(state, "quality_scoring")
+        try:
+            return await self.quality_agent.aprocess(state)
+        except Exception as e:
+            state.add_error("quality_scoring", str(e))
+            return state
+    
+    def _run_combined_analysis(self, state: AgentState) -> AgentState:
+        """Run combined summary and quality analysis."""
+        self._record_attempt(state, "combined_analysis")
+        try:
+            return self.combined_agent.process(state)
+        except Exception as e:
+            state.add_error("combined_analysis", str(e))
+            return state
+    
+    async def _arun_combined_analysis(self, state: AgentState) -> AgentState:
+        """Run combined summary and quality analysis on the event loop."""
+        self._record_attempt(state, "combined_analysis")
+        try:
+            return await self.combined_agent.aprocess(state)
+        except Exception as e:
+            state.add_error("combined_analysis", str(e))
+            return state
+    
+    def _run_analysis(self, state: AgentState) -> AgentState:
+        """Run analysis, serving repeated transcripts from the result cache."""
+        if self._use_cached_analysis(state):
+            return state
+        self._run_analysis_agents(state)
+        self._cache_analysis(state)
+        return state
+    
+    async def _arun_analysis(self, state: AgentState) -> AgentState:
+        """Async counterpart of _run_analysis; embedding runs off the event loop."""
+        if await asyncio.to_thread(self._use_cached_analysis, state):
+            return state
+        await self._arun_analysis_agents(state)
+        await asyncio.to_thread(self._cache_analysis, state)
+        return state
+    
+    def _use_cached_analysis(self, state: AgentState) -> bool:
+        """Fill summary and scores from the cache on a first-attempt hit."""
+        if not self.result_cache or not state.transcript_text or state.summary or state.quality_score:
+            return False
+        cached = self.result_cache.get(state.transcript_text)
+        if cached is None:
+            return False
+        state.summary, state.quality_score = cached
+        logger.info("Served analysis for call %s from cache", state.call_id)
+        return True
+    
+    def _cache_analysis(self, state: AgentState) -> None:
+        """Store a complete analysis result."""
+        if self.result_cache and state.transcript_text and state.summary and state.quality_score:
+            self.result_cache.put(state.transcript_text, (state.summary, state.quality_score))
+    
+    def _run_analysis_agents(self, state: AgentState) -> AgentState:
+        """Run the pending analysis agents concurrently on the shared agent pool."""
+        if self.combined_agent:
+            return self._run_combined_analysis(state)
+        
+        # Tokenize once up front; both agents then read the bounded transcript from the state
+        self.quality_agent.prepare_transcript(state)
+        
+        runners = []
+        if state.summary is None:
+            runners.append(self._run_summarization)
+        if state.quality_score is None:
+            runners.append(self._run_quality_scoring)
+        
+        # Each agent writes its own field, so they can share the state object
+        futures = [get_agent_executor().submit(run, state) for run in runners]
+        for future in futures:
+            future.result()
+        return state
+    
+    async def _arun_analysis_agents(self, state: AgentState) -> AgentState:
+        """Async counterpart of _run_analysis_agents; latency is the slower of the two calls."""
+        if self.combined_agent:
+            return await self._arun_combined_analysis(state)
+        
+        # Tokenize once up front; both agents then read the bounded transcript from the state
+        self.quality_agent.prepare_transcript(state)
+        
+        runners = []
+        if state.summary is None:
+            runners.append(self._arun_summarization(state))
+        if state.quality_score is None:
+            runners.append(self._arun_quality_scoring(state))
+        
+        await asyncio.gather(*runners)
+        return state
+    
+    @staticmethod
+    def _record_attempt(state: AgentState, agent_name: str) -> None:
+        """Count a re-run in the node itself; state changes made in routers are discarded."""
+        state.retry_counts[agent_name] = sum(1 for e in state.errors if e["agent"] == agent_name)
+    
     def _should_retry(self, state: AgentState, agent_name: str, max_retries: int = 2) -> bool:
         """Check if an agent should retry based on errors and per-agent retry count."""
         # Get current retry count BEFORE incrementing
@@ -127,15 +287,23 @@ class CallCenterWorkflow:
         # We need to detect if this is a fresh error, not from a previous attempt
         has_new_error = len(agent_errors) > current_retries
         
-        logger.info(f"Checking retry for {agent_name}: {len(agent_errors)} total errors, {current_retries} retries so far, new error: {has_new_error}")
+        logger.info(
+            "Checking retry for %s: %d total errors, %d retries so far, new error: %s",
+            agent_name, len(agent_errors), current_retries, has_new_error
+        )
         
         if has_new_error and current_retries < max_retries:
-            state.retry_counts[agent_name] = current_retries + 1
             latest_error = agent_errors[-1]['error'] if agent_errors else 'Unknown'
-            logger.warning(f"Retrying {agent_name} (attempt {state.retry_counts[agent_name]}/{max_retries}) due to error: {latest_error[:100]}")
+            logger.warning(
+                "Retrying %s (attempt %d/%d) due to error: %.100s",
+                agent_name, current_retries + 1, max_retries, latest_error
+            )
             return True
         elif has_new_error and current_retries >= max_retries:
-            logger.error(f"Max retries ({max_retries}) exceeded for {agent_name}. Final error: {agent_errors[-1]['error'] if agent_errors else 'Unknown'}")
+            logger.error(
+                "Max retries (%d) exceeded for %s. Final error: %s",
+                max_retries, agent_name, agent_errors[-1]['error'] if agent_errors else 'Unknown'
+            )
         
         return False
     
@@ -150,61 +318,116 @@ class CallCenterWorkflow:
         
         return "end"  # Can't proceed without text
     
-    def _route_after_summarization(self, state: AgentState) -> str:
-        """Route after summarization with simple retry logic."""
-        if self._should_retry(state, "summarization"):
-            return "retry"
+    def _route_after_analysis(self, state: AgentState) -> str:
+        """Route after analysis; a retry re-runs only the agents that failed."""
+        if self.combined_agent:
+            return "retry" if self._should_retry(state, "combined_analysis") else "end"
         
-        return "continue" if state.summary else "end"
-    
-    def _route_after_quality_scoring(self, state: AgentState) -> str:
-        """Route after quality scoring with simple retry logic."""
-        if self._should_retry(state, "quality_scoring"):
-            return "retry"
+        retry_summary = self._should_retry(state, "summarization")
+        retry_quality = self._should_retry(state, "quality_scoring")
         
-        return "end"  # Always end after quality scoring (success or final failure)
+        return "retry" if retry_summary or retry_quality else "end"
     
-    def process_call(self, input_data: CallInput) -> ProcessingResult:
-        """Process a call through the simplified graph."""
+    def process_call(
+        self,
+        input_data: CallInput,
+        on_node_complete: Optional[Callable[[str], None]] = None
+    ) -> ProcessingResult:
+        """
+        Process a call through the simplified graph.
+        
+        Args:
+            input_data: The call to process
+            on_node_complete: Called with each node's name ("transcription",
+                "analysis") as it finishes, retries included, e.g. to drive a
+                progress display
+        """
         start_time = time.time()
         
         try:
-            # Create state
-            state = AgentState(
-                call_id=str(uuid.uuid4())[:8],
-                input_data=input_data
-            )
-            
             # Run graph
-            result = self.graph.invoke(state)
-            
-            # LangGraph returns a dict, convert back to AgentState
-            final_state = AgentState(**result)
-            
-            # Determine status
-            if final_state.summary and final_state.quality_score and not final_state.errors:
-                status = "success"
-            elif final_state.summary or final_state.quality_score:
-                status = "partial"
+            if on_node_complete is None:
+                result = self.graph.invoke(self._initial_state(input_data))
             else:
-                status = "failed"
+                # Stream node updates alongside the state, which ends as the final result
+                for mode, chunk in self.graph.stream(
+                    self._initial_state(input_data), stream_mode=["updates", "values"]
+                ):
+                    if mode == "values":
+                        result = chunk
+                    else:
+                        for node in chunk:
+                            on_node_complete(node)
+            return self._build_result(result, start_time)
             
-            # Create result
-            return ProcessingResult(
-                call_id=final_state.call_id,
-                status=status,
-                transcript_text=final_state.transcript_text,
-                summary=final_state.summary,
-                quality_score=final_state.quality_score,
-                errors=final_state.errors,
-                processing_time_seconds=time.time() - start_time
-            )
+        except Exception as e:
+            return self._build_failure(e, start_time)
+    
+    async def aprocess_call(
+        self,
+        input_data: CallInput,
+        on_node_complete: Optional[Callable[[str], None]] = None
+    ) -> ProcessingResult:
+        """Process a call through the graph on the running event loop; see process_call."""
+        start_time = time.time()
+        
+        try:
+            if on_node_complete is None:
+                result = await self.graph.ainvoke(self._initial_state(input_data))
+            else:
+                async for mode, chunk in self.graph.astream(
+                    self._initial_state(input_data), stream_mode=["updates", "values"]
+                ):
+                    if mode == "values":
+                        result = chunk
+                    else:
+                        for node in chunk:
+                            on_node_complete(node)
+            return self._build_result(result, start_time)
             
         except Exception as e:
-            logger.error(f"Workflow execution failed: {str(e)}")
-            return ProcessingResult(
-                call_id="error",
-                status="failed",
-                errors=[{"agent": "worflow", "error": str(e), "timestamp": ""}],
-                processing_time_seconds=time.time() - start_time
-            )
\ No newline at end of file
+            return self._build_failure(e, start_time)
+    
+    @staticmethod
+    def _initial_state(input_data: CallInput) -> AgentState:
+        """Create the starting state for a call."""
+        return AgentState(
+            call_id=str(uuid.uuid4())[:8],
+            input_data=input_data
+        )
+    
+    @staticmethod
+    def _build_result(result: dict, start_time: float) -> ProcessingResult:
+        """Convert the graph output into a ProcessingResult."""
+        # LangGraph returns a dict, convert back to AgentState
+        final_state = AgentState(**result)
+        
+        # Determine status
+        if final_state.summary and final_state.quality_score and not final_state.errors:
+            status = "success"
+        elif final_state.summary or final_state.quality_score:
+            status = "partial"
+        else:
+            status = "failed"
+        
+        # Create result
+        return ProcessingResult(
+            call_id=final_state.call_id,
+            status=status,
+            transcript_text=final_state.transcript_text,
+            summary=final_state.summary,
+            quality_score=final_state.quality_score,
+            errors=final_state.errors,
+            processing_time_seconds=time.time() - start_time
+        )
+    
+    @staticmethod
+    def _build_failure(error: Exception, start_time: float) -> ProcessingResult:
+        """Build the result for a workflow that raised."""
+        logger.error("Workflow execution failed: %s", error)
+        return ProcessingResult(
+            call_id="error",
+            status="failed",
+            errors=[{"agent": "worflow", "error": str(error), "timestamp": ""}],
+            processing_time_seconds=time.time() - start_time
+        )
\ No newline at end of file